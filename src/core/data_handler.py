@@ -1,8 +1,15 @@
 # src/core/data_handler.py
 
+import glob
+import heapq
+import os
+
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Iterator, Dict, Any, Optional
+from typing import Iterator, Dict, Any, Optional, Sequence, Union
+
+from src.core.symbols import SymbolRegistry
 
 
 class CSVDataHandler:
@@ -73,3 +80,303 @@ class CSVDataHandler:
             return next(self._iter)
         except StopIteration:
             return None
+
+
+class ColumnarCSVDataHandler:
+    """
+    Columnar CSV DataHandler:
+    - Loads the CSV once and keeps each field as a contiguous NumPy array
+    - Parses the whole timestamp column in one call (no per-row to_datetime)
+    - Fills missing bid/ask with last in one vectorized pass
+    - stream_next() yields the same row dicts as CSVDataHandler
+    - stream_batch() yields whole array slices for vectorized consumers
+      (symbol as object array and as integer IDs from `registry`; missing
+      volume as -1)
+
+    Same CSV schema as CSVDataHandler. Epoch timestamps are read as
+    seconds since 1970-01-01 UTC (naive datetimes).
+    """
+
+    def __init__(self, csv_path: str, row_chunk: int = 65_536):
+        if row_chunk <= 0:
+            raise ValueError("row_chunk must be > 0")
+        self.csv_path = csv_path
+        self.row_chunk = row_chunk
+
+        self._load_columns()
+        self._pos = 0
+        self._iter = self._row_iterator(0)
+
+    def _load_columns(self):
+        cols = frame_columns(pd.read_csv(self.csv_path))
+
+        # Stable sort keeps file order for rows sharing a timestamp
+        order = np.argsort(cols["timestamp"], kind="stable")
+        cols = {k: v[order] for k, v in cols.items()}
+
+        self._cols = cols
+        self.timestamps = cols["timestamp"]  # datetime64[ns], UTC
+        self.symbols = cols["symbol"]
+        self.bid = cols["bid"]
+        self.ask = cols["ask"]
+        self.last = cols["last"]
+        self.volume = cols["volume"]
+
+        self.registry = SymbolRegistry()
+        self.symbol_ids = self.registry.intern_many(self.symbols)
+        self.tz_utc = len(self) > 0 and cols["ts_obj"][0].tzinfo is not None
+
+    def __len__(self) -> int:
+        return len(self.last)
+
+    def _row_iterator(self, first: int) -> Iterator[Dict[str, Any]]:
+        n = len(self)
+        step = self.row_chunk
+
+        for start in range(first, n, step):
+            stop = min(start + step, n)
+            for row in _iter_rows(self._cols, start, stop):
+                self._pos += 1
+                yield row
+
+    def stream_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns next market row dict, or None if data exhausted.
+        """
+        try:
+            return next(self._iter)
+        except StopIteration:
+            return None
+
+    def stream_batch(self, size: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the next `size` rows as a dict of array slices (views, no
+        copies), or None if data exhausted. Shares the read position with
+        stream_next().
+        """
+        if size <= 0:
+            raise ValueError("size must be > 0")
+        start = self._pos
+        if start >= len(self):
+            return None
+        stop = min(start + size, len(self))
+
+        self._pos = stop
+        self._iter = self._row_iterator(stop)
+
+        return {
+            "timestamp": self.timestamps[start:stop],
+            "symbol": self.symbols[start:stop],
+            "symbol_id": self.symbol_ids[start:stop],
+            "bid": self.bid[start:stop],
+            "ask": self.ask[start:stop],
+            "last": self.last[start:stop],
+            "volume": self.volume[start:stop],
+        }
+
+
+class ChunkedCSVDataHandler:
+    """
+    Streaming CSV DataHandler for files too large to load at once:
+    - Reads the CSV in fixed-size chunks (pd.read_csv(chunksize=...))
+    - Parses each chunk columnar, then streams its rows out
+    - Never sorts: the file must already be in timestamp order
+
+    Peak memory is bounded by chunk_size rows and the first event is
+    available as soon as the first chunk is parsed, whatever the file size.
+
+    With check_sorted=True (default) an out-of-order timestamp, within a
+    chunk or across a chunk boundary, raises ValueError.
+    """
+
+    def __init__(self, csv_path: str, chunk_size: int = 100_000, check_sorted: bool = True):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self.csv_path = csv_path
+        self.chunk_size = chunk_size
+        self.check_sorted = check_sorted
+        self._iter = self._row_iterator()
+
+    def _chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        prev_ts = None
+        with pd.read_csv(self.csv_path, chunksize=self.chunk_size) as reader:
+            for df in reader:
+                cols = frame_columns(df)
+                ts = cols["timestamp"]
+                if self.check_sorted and len(ts):
+                    if prev_ts is not None and ts[0] < prev_ts:
+                        raise ValueError(
+                            f"CSV not sorted by timestamp: {ts[0]} after {prev_ts}"
+                        )
+                    bad = np.flatnonzero(ts[1:] < ts[:-1])
+                    if len(bad):
+                        i = bad[0]
+                        raise ValueError(
+                            f"CSV not sorted by timestamp: {ts[i + 1]} after {ts[i]}"
+                        )
+                    prev_ts = ts[-1]
+                yield cols
+
+    def _row_iterator(self) -> Iterator[Dict[str, Any]]:
+        for cols in self._chunks():
+            yield from _iter_rows(cols, 0, len(cols["last"]))
+
+    def stream_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns next market row dict, or None if data exhausted.
+        """
+        try:
+            return next(self._iter)
+        except StopIteration:
+            return None
+
+
+class MultiFileDataHandler:
+    """
+    k-way merge DataHandler over many time-sorted CSV files:
+    - Takes a list of CSV paths, or a directory (every file matching `pattern`)
+    - Each file is read lazily via ChunkedCSVDataHandler
+    - Rows are merged on timestamp with a heap holding one row per file
+
+    Typical layout is one file per symbol, but any time-sorted file in the
+    same CSV schema works. Memory is O(files * chunk_size), independent of
+    the total row count; the combined frame is never built.
+
+    Rows with equal timestamps come out in the order the files were given
+    (sorted file names for a directory).
+    """
+
+    def __init__(
+        self,
+        paths: Union[str, Sequence[str]],
+        pattern: str = "*.csv",
+        chunk_size: int = 10_000,
+        check_sorted: bool = True,
+    ):
+        if isinstance(paths, (str, os.PathLike)):
+            if os.path.isdir(paths):
+                paths = sorted(glob.glob(os.path.join(paths, pattern)))
+            else:
+                paths = [paths]
+        self.paths = [str(p) for p in paths]
+        if not self.paths:
+            raise ValueError("MultiFileDataHandler needs at least one CSV file")
+
+        self.sources = [
+            ChunkedCSVDataHandler(p, chunk_size=chunk_size, check_sorted=check_sorted)
+            for p in self.paths
+        ]
+        self._heap = []
+        self._primed = False
+
+    def _push_next(self, idx: int):
+        row = self.sources[idx].stream_next()
+        if row is not None:
+            # idx breaks timestamp ties, so row dicts are never compared
+            heapq.heappush(self._heap, (row["timestamp"], idx, row))
+
+    def stream_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns next market row dict across all files, or None if every
+        file is exhausted.
+        """
+        if not self._primed:
+            # Files are opened lazily: nothing is read until the first call
+            for idx in range(len(self.sources)):
+                self._push_next(idx)
+            self._primed = True
+
+        if not self._heap:
+            return None
+
+        _, idx, row = heapq.heappop(self._heap)
+        self._push_next(idx)
+        return row
+
+
+# -----------------------
+# Column helpers
+# -----------------------
+def frame_columns(df: pd.DataFrame, objects: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Convert a raw CSV frame to contiguous column arrays, in file order.
+    Missing bid/ask fall back to last; missing volume is -1 and flagged in
+    "has_volume". objects=False skips "ts_obj" (one Python datetime per
+    row) for array-only consumers.
+    """
+    required = {"timestamp", "symbol", "last"}
+    missing = required - set(df.columns)
+    if missing:
+        raise ValueError(f"CSV missing required columns: {missing}")
+
+    ts = _parse_ts_column(df["timestamp"])
+    last = np.ascontiguousarray(df["last"].to_numpy(dtype=np.float64))
+
+    if "volume" in df.columns:
+        vol = df["volume"].to_numpy(dtype=np.float64)
+        has_volume = ~np.isnan(vol)
+        volume = np.where(has_volume, vol, -1).astype(np.int64)
+    else:
+        has_volume = np.zeros(len(df), dtype=bool)
+        volume = np.full(len(df), -1, dtype=np.int64)
+
+    cols = {
+        "timestamp": _utc_datetime64(ts),
+        "symbol": df["symbol"].to_numpy(dtype=object),
+        "bid": _fill_with(df, "bid", last),
+        "ask": _fill_with(df, "ask", last),
+        "last": last,
+        "volume": volume,
+        "has_volume": has_volume,
+    }
+    if objects:
+        cols["ts_obj"] = ts.dt.to_pydatetime()
+    return cols
+
+
+def _iter_rows(cols: Dict[str, np.ndarray], start: int, stop: int) -> Iterator[Dict[str, Any]]:
+    # Convert the slice of each column to Python lists in one go: per-row
+    # access then stays in C and yields plain floats/ints.
+    vols = [
+        v if has else None
+        for v, has in zip(
+            cols["volume"][start:stop].tolist(),
+            cols["has_volume"][start:stop].tolist(),
+        )
+    ]
+    for ts, sym, bid, ask, last, vol in zip(
+        cols["ts_obj"][start:stop],
+        cols["symbol"][start:stop],
+        cols["bid"][start:stop].tolist(),
+        cols["ask"][start:stop].tolist(),
+        cols["last"][start:stop].tolist(),
+        vols,
+    ):
+        yield {
+            "timestamp": ts,
+            "symbol": sym,
+            "bid": bid,
+            "ask": ask,
+            "last": last,
+            "volume": vol
+        }
+
+
+def _parse_ts_column(col: pd.Series) -> pd.Series:
+    # If numeric, treat as epoch seconds; else parse strings in one call
+    if pd.api.types.is_numeric_dtype(col):
+        return pd.to_datetime(col, unit="s")
+    return pd.to_datetime(col)
+
+
+def _utc_datetime64(ts: pd.Series) -> np.ndarray:
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+    return ts.to_numpy(dtype="datetime64[ns]")
+
+
+def _fill_with(df: pd.DataFrame, name: str, fallback: np.ndarray) -> np.ndarray:
+    if name not in df.columns:
+        return fallback.copy()
+    vals = df[name].to_numpy(dtype=np.float64)
+    return np.where(np.isnan(vals), fallback, vals)
@@ -1,25 +1,91 @@
 # src/core/engine.py
 
+import heapq
+from collections import deque
+from itertools import count
 from queue import Queue, Empty
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from src.core.events import MarketEvent
+import numpy as np
+import pandas as pd
+
+from src.core.event_log import PrintEventLog
+from src.core.quote_book import QuoteBook
+from src.core.symbols import SymbolRegistry
+from src.core.events import MarketEvent, MarketBatchEvent, MARKET, SIGNAL, ORDER, FILL, MARKET_BATCH
+from src.core.timeutil import NAT, to_ns
 
 
 class SimpleEngine:
     """
     Event-driven engine:
     MARKET -> Strategy -> SIGNAL -> Portfolio -> ORDER -> Execution -> FILL -> Portfolio update
+
+    Modes:
+    - backtest (default): single-threaded, events in a plain deque; run()
+      stops as soon as the queue is empty
+    - live=True: thread-safe Queue, so other threads can put_market_event();
+      run() waits up to max_idle_timeouts one-second timeouts for new events
+
+    SIGNAL / ORDER / FILL events go to `event_log` (src/core/event_log.py).
+    Default prints them to stdout; NullEventLog() is quiet mode and costs
+    one None check per event. Every run*() call ends with
+    event_log.close(), so file sinks release their handle (and reopen in
+    append mode if the engine runs again).
+
+    Limit orders (order_type "LMT") that are not marketable rest in the
+    execution simulator and are matched against every later MARKET event;
+    their fills re-enter the queue like any other. submit_order() lets
+    strategies or callers place LMT / CXL orders directly.
+
+    latency: optional LatencyModel (src/execution/latency.py). Orders then
+    reach the simulator order_delay() later in market time and are matched
+    against the quote in effect at arrival; fills reach the portfolio
+    ack_delay() after that. Delayed messages wait in a time-ordered heap
+    and are released before the first tick at or after their due time
+    (messages still pending when the data ends are released against the
+    last quotes). Fill timestamps are simulated exchange times.
+
+    Quotes are kept in a QuoteBook (arrays indexed by symbol ID) sharing the
+    portfolio's SymbolRegistry when it has one.
     """
 
-    def __init__(self, strategy, portfolio, execution):
-        self.events = Queue()
+    def __init__(self, strategy, portfolio, execution, live: bool = False, event_log=None, latency=None):
+        self.live = live
+        self.events = Queue() if live else deque()
+        self._put = self.events.put if live else self.events.append
         self.strategy = strategy
         self.portfolio = portfolio
         self.execution = execution
+        # Resting-order matching hook (ExecutionSimulator.on_market)
+        self._exec_market = getattr(execution, "on_market", None)
+
+        self.event_log = event_log if event_log is not None else PrintEventLog()
+        self._log = self.event_log.record if self.event_log.enabled else None
+
+        # Simulated clock and delayed messages: heap of
+        # (due ns, seq, due timestamp, handler, event)
+        self.latency = latency
+        self._timed = []
+        self._seq = count()
+        self._now_ns = NAT
+        self._now_dt = None
 
         self.running = False
-        self.market_state = {}  # symbol -> {"bid":..., "ask":..., "last":...}
+        registry = getattr(portfolio, "registry", None)
+        self.registry = registry if registry is not None else SymbolRegistry()
+        self.quotes = QuoteBook(self.registry)
+        if getattr(execution, "quotes", False) is None:
+            # Let the simulator see quotes / volume (impact models)
+            execution.quotes = self.quotes
+
+        # Dispatch table indexed by Event.kind (see src/core/events.py)
+        self._handlers = [None] * 5
+        self._handlers[MARKET] = self._on_market
+        self._handlers[SIGNAL] = self._on_signal
+        self._handlers[ORDER] = self._on_order
+        self._handlers[FILL] = self._on_fill
+        self._handlers[MARKET_BATCH] = self._on_market_batch
 
     # -----------------------
     # Inject market events
@@ -36,7 +102,20 @@ class SimpleEngine:
             last=last,
             volume=volume
         )
-        self.events.put(me)
+        self._put(me)
+
+    def submit_order(self, order):
+        """
+        Queue an OrderEvent (e.g. a LMT order or a CXL for a resting one).
+        """
+        self._put(order)
+
+    @property
+    def market_state(self):
+        """
+        symbol -> {"bid":..., "ask":..., "last":...} snapshot of the quote book.
+        """
+        return self.quotes.to_dict()
 
     # -----------------------
     # Helper: decide fill price
@@ -48,17 +127,17 @@ class SimpleEngine:
           - SELL at bid
         Falls back to last if bid/ask missing.
         """
-        symbol = order_event.symbol
         side = getattr(order_event, "direction", None)
-    
-        s = self.market_state.get(symbol)
-        if s is None:
+
+        quotes = self.quotes
+        sid = quotes.registry.get(order_event.symbol)
+        if sid is None or sid >= quotes.capacity or not quotes.has_quote[sid]:
             return None
+
+        bid, ask, last = float(quotes.bid[sid]), float(quotes.ask[sid]), float(quotes.last[sid])
     
-        bid, ask, last = s.get("bid"), s.get("ask"), s.get("last")
-    
-        # If we have a proper book:
-        if bid is not None and ask is not None:
+        # If we have a proper book (NaN = missing):
+        if bid == bid and ask == ask:
             if side == "BUY":
                 return ask
             elif side == "SELL":
@@ -67,13 +146,58 @@ class SimpleEngine:
             return (bid + ask) / 2.0
     
         # If only last is known:
-        return last
+        return last if last == last else None
+
+    # -----------------------
+    # Simulated latency
+    # -----------------------
+    def _schedule(self, delay: int, handler, event):
+        """
+        Run handler(event) `delay` ns of market time from now (right away
+        if there is no delay or no market time yet).
+        """
+        if delay <= 0 or self._now_dt is None:
+            handler(event)
+            return
+        due_dt = self._now_dt + timedelta(microseconds=delay / 1000)
+        heapq.heappush(self._timed, (self._now_ns + delay, next(self._seq), due_dt, handler, event))
+
+    def _advance(self, ts_ns: int):
+        """
+        Release delayed messages due before ts_ns, in time order, each at
+        its own simulated time.
+        """
+        timed = self._timed
+        while timed and timed[0][0] < ts_ns:
+            due, _, due_dt, handler, event = heapq.heappop(timed)
+            self._now_ns, self._now_dt = due, due_dt
+            handler(event)
+
+    def _release_pending(self):
+        if self._timed:
+            self._advance(np.iinfo(np.int64).max)
 
     # -----------------------
     # Main event loop
     # -----------------------
     def run(self, max_events: int = 100, max_idle_timeouts: int = 3, print_summary: bool = True):
+        """
+        Process queued events until the queue is drained (backtest) or no
+        event arrives for max_idle_timeouts seconds (live), or max_events.
+        """
         self.running = True
+        if self.live:
+            self._run_live(max_events, max_idle_timeouts, print_summary)
+        else:
+            self._drain(max_events)
+            self._release_pending()
+
+        self.event_log.close()
+        if print_summary:
+            print("Engine stopped.")
+            print("Portfolio snapshot:", self.portfolio.snapshot())
+
+    def _run_live(self, max_events: int, max_idle_timeouts: int, print_summary: bool):
         processed = 0
         idle_timeouts = 0
 
@@ -90,79 +214,174 @@ class SimpleEngine:
                 continue
 
             processed += 1
+            self._process(event)
 
-            # 1) MARKET
-            if event.type == "MARKET":
-                self.market_state[event.symbol] = {
-                    "bid": event.bid,
-                    "ask": event.ask,
-                    "last": event.last
-                }
-
-                # mark-to-market using this market event's timestamp
-                mid_px = (event.bid + event.ask) / 2.0 if event.bid and event.ask else event.last
-                if mid_px is not None:
-                    self.portfolio.mark_to_market(event.symbol, mid_px, event.timestamp)
-
-                # strategy reacts
-                signal = self.strategy.on_market_event(event)
-                if signal is not None:
-                    self.events.put(signal)
-
-            # 2) SIGNAL -> ORDER
-            elif event.type == "SIGNAL":
-                order = self.portfolio.on_signal(event)
-                if order is not None:
-                    self.events.put(order)
-
-                print(
-                    f"[SIGNAL] {event.timestamp} {event.symbol} "
-                    f"{event.signal_type} strength={event.strength}"
-                )
-
-            # 3) ORDER -> FILL
-            elif event.type == "ORDER":
-                fill_px = self._get_fill_price(event)
-                if fill_px is None:
-                    continue
-            
-                fill = self.execution.on_order(event, fill_px)
-                self.events.put(fill)
-            
-                print(
-                    f"[ORDER]  {event.timestamp} {event.symbol} "
-                    f"{event.direction} qty={event.quantity} type={event.order_type} "
-                    f"fill_px~{fill_px:.2f}"
-                )
-
-
-            # 4) FILL -> portfolio update
-            elif event.type == "FILL":
-                self.portfolio.on_fill(event)
-                 # 2) immediately mark to market using latest known price
-                mkt = self.market_state.get(event.symbol)
-                if mkt is not None:
-                    bid = mkt.get("bid")
-                    ask = mkt.get("ask")
-                    last = mkt.get("last")
-            
-                    if bid is not None and ask is not None:
-                        mid_px = (bid + ask) / 2.0
-                    else:
-                        mid_px = last
-            
-                    if mid_px is not None:
-                        self.portfolio.mark_to_market(event.symbol, mid_px, event.timestamp)
-
-                print(
-                    f"[FILL]   {event.timestamp} {event.symbol} "
-                    f"{event.direction} qty={event.quantity} px={event.fill_price:.2f} "
-                    f"comm={event.commission:.2f}"
-                )
+    def _process(self, event):
+        # Route on the event's integer tag (one list index, no string compares)
+        self._handlers[event.kind](event)
 
-        if print_summary:
-            print("Engine stopped.")
-            print("Portfolio snapshot:", self.portfolio.snapshot())
+    # 1) MARKET
+    def _on_market(self, event):
+        if self.latency is not None:
+            ts_ns = to_ns(event.timestamp)
+            self._advance(ts_ns)
+            self._now_ns, self._now_dt = ts_ns, event.timestamp
+
+        quotes = self.quotes
+        quotes.update(quotes.sid(event.symbol), event.bid, event.ask, event.last, event.volume)
+
+        # resting limit orders trade against this update
+        if self._exec_market is not None:
+            for fill in self._exec_market(event):
+                self._deliver(fill)
+
+        # mark-to-market using this market event's timestamp
+        mid_px = (event.bid + event.ask) / 2.0 if event.bid and event.ask else event.last
+        if mid_px is not None:
+            self.portfolio.mark_to_market(event.symbol, mid_px, event.timestamp)
+
+        # strategy reacts
+        signal = self.strategy.on_market_event(event)
+        if signal is not None:
+            self._put(signal)
+
+    # 1b) MARKET_BATCH (see run_batches)
+    def _on_market_batch(self, batch):
+        n = len(batch)
+        if n == 0:
+            return
+
+        # Batch IDs come from the data handler's registry: map to ours
+        sid = self.quotes.sids(batch.symbols)[batch.symbol_id]
+        bid, ask, last = batch.bid, batch.ask, batch.last
+
+        # Quote book in one vectorized write (last tick per symbol wins).
+        # Delayed messages are released in between, as in the per-tick
+        # path: a message due at t arrives after the ticks stamped <= t.
+        done = 0
+        if self._timed:
+            ts = batch.timestamp.view("i8")
+            while self._timed and self._timed[0][0] < ts[-1]:
+                due = self._timed[0][0]
+                k = int(np.searchsorted(ts, due, side="right"))
+                if k > done:
+                    self.quotes.update_many(sid[done:k], bid[done:k], ask[done:k], last[done:k], batch.volume[done:k])
+                    self._match_resting(batch, done, k)
+                    done = k
+                self._advance(due + 1)
+        self.quotes.update_many(sid[done:], bid[done:], ask[done:], last[done:], batch.volume[done:])
+        self._match_resting(batch, done, n)
+
+        # Marks only for each symbol's last tick in the batch
+        rev_last = np.unique(sid[::-1], return_index=True)[1]
+        last_rows = np.sort(n - 1 - rev_last)
+
+        has_book = (bid != 0) & (ask != 0) & ~np.isnan(bid) & ~np.isnan(ask)
+        mid = np.where(has_book, (bid + ask) / 2.0, last)
+
+        stamps = pd.to_datetime(batch.timestamp[last_rows], utc=batch.tz_utc).to_pydatetime()
+        names = self.registry.symbols
+        for i, ts in zip(last_rows.tolist(), stamps):
+            self.portfolio.mark_to_market(names[sid[i]], float(mid[i]), ts)
+        if self.latency is not None:
+            self._now_ns, self._now_dt = int(batch.timestamp[-1].view("i8")), stamps[-1]
+
+        signals = self.strategy.on_market_batch(batch)
+        if not signals:
+            return
+
+        # The hook has seen the whole batch: its signals are decided, and
+        # their orders priced and filled, at the batch's last tick
+        end_dt = stamps[-1]
+        for signal in signals:
+            signal.timestamp = end_dt
+
+        on_signals = getattr(self.portfolio, "on_signals", None)
+        if on_signals is None:
+            for signal in signals:
+                self._put(signal)
+            return
+
+        # Size and risk-check the tick's signals together
+        for order in on_signals(signals):
+            self._put(order)
+        if self._log is not None:
+            for signal in signals:
+                self._log(signal)
+
+    def _match_resting(self, batch, lo: int, hi: int):
+        """
+        Resting limit orders trade against every tick of their symbols in
+        batch rows [lo, hi), each at that tick's market time.
+        """
+        has_resting = getattr(self.execution, "has_resting", None)
+        if has_resting is None or not has_resting():
+            return
+        books = self.execution.books
+        sub = batch.rows(lo, hi)
+        ts = sub.timestamp.view("i8").tolist()
+        for ts_ns, tick in zip(ts, sub.ticks()):
+            if tick.symbol in books:
+                if self.latency is not None:
+                    self._now_ns, self._now_dt = ts_ns, tick.timestamp
+                for fill in self._exec_market(tick):
+                    self._deliver(fill)
+
+    # 2) SIGNAL -> ORDER
+    def _on_signal(self, event):
+        order = self.portfolio.on_signal(event)
+        if order is not None:
+            self._put(order)
+
+        if self._log is not None:
+            self._log(event)
+
+    # 3) ORDER -> FILL
+    def _on_order(self, event):
+        if self.latency is None:
+            self._execute_order(event)
+        else:
+            self._schedule(self.latency.order_delay(), self._execute_order, event)
+
+    def _execute_order(self, event):
+        # Runs at the order's (simulated) arrival at the exchange
+        fill_px = self._get_fill_price(event)
+        if fill_px is None and event.order_type == "MKT":
+            return
+
+        # LMT orders may rest and CXL orders never fill: no fill event then
+        timestamp = self._now_dt if self.latency is not None else event.timestamp
+        fill = self.execution.on_order(event, fill_px, timestamp)
+
+        # Log the order before its fill can be delivered (and logged)
+        if self._log is not None:
+            # Expected fill price only for orders that traded (not for
+            # resting LMT or CXL orders)
+            self._log(event, fill_px if fill is not None else None)
+
+        if fill is not None:
+            self._deliver(fill)
+
+    def _deliver(self, fill):
+        # Exchange -> strategy: fills reach the portfolio after ack_delay()
+        if self.latency is None:
+            self._put(fill)
+        else:
+            self._schedule(self.latency.ack_delay(), self._on_fill, fill)
+
+    # 4) FILL -> portfolio update
+    def _on_fill(self, event):
+        self.portfolio.on_fill(event)
+        # immediately mark to market using latest known price
+        quotes = self.quotes
+        sid = quotes.registry.get(event.symbol)
+        if sid is not None and sid < quotes.capacity and quotes.has_quote[sid]:
+            mid_px = quotes.mid(sid)
+            if mid_px is not None:
+                self.portfolio.mark_to_market(event.symbol, mid_px, event.timestamp)
+
+        if self._log is not None:
+            self._log(event)
 
     # -----------------------
     # DataHandler-driven run
@@ -176,17 +395,24 @@ class SimpleEngine:
         print_summary: bool = True,
     ):
         """
-        Stream data row-by-row from the datahandler and enqueue MarketEvents.
-        After enqueuing (or hitting max_rows), run the engine once to process
-        all events.
+        Pull-based replay: fetch one row from the datahandler, process its
+        MarketEvent and the whole SIGNAL -> ORDER -> FILL cascade it causes,
+        and only then fetch the next row.
+
+        The queue never holds more than one tick's cascade, and the strategy
+        sees fills from earlier ticks before it reacts to later ones.
+        engine_max_events caps the total number of processed events;
+        engine_idle_timeouts is unused (kept for call compatibility).
         """
+        self.running = True
         rows = 0
-    
-        while True:
+        processed = 0
+
+        while self.running and processed < engine_max_events:
             row = datahandler.stream_next()
             if row is None:
                 break
-    
+
             self.put_market_event(
                 symbol=row["symbol"],
                 bid=row["bid"],
@@ -195,14 +421,98 @@ class SimpleEngine:
                 volume=row["volume"],
                 timestamp=row["timestamp"],
             )
-    
+            processed += self._drain(engine_max_events - processed)
+
             rows += 1
             if max_rows is not None and rows >= max_rows:
                 break
-    
-        # Now process everything in one go
-        self.run(
-            max_events=engine_max_events,
-            max_idle_timeouts=engine_idle_timeouts,
-            print_summary=print_summary,
-        )
\ No newline at end of file
+
+        self._release_pending()
+        self.event_log.close()
+        if print_summary:
+            print("Engine stopped.")
+            print("Portfolio snapshot:", self.portfolio.snapshot())
+
+    def _drain(self, max_events: float = float("inf")) -> int:
+        """
+        Process queued events until the queue is empty. Returns the count.
+        """
+        processed = 0
+        if self.live:
+            while processed < max_events:
+                try:
+                    event = self.events.get_nowait()
+                except Empty:
+                    break
+                self._process(event)
+                processed += 1
+        else:
+            events = self.events
+            while self.running and processed < max_events and events:
+                self._process(events.popleft())
+                processed += 1
+        return processed
+
+    # -----------------------
+    # Batch (struct-of-arrays) run
+    # -----------------------
+    def run_batches(
+        self,
+        datahandler,
+        batch_size: int = 4096,
+        max_rows: int = None,
+        print_summary: bool = True,
+    ):
+        """
+        Replay a datahandler with stream_batch() support (columnar or tick
+        store handlers) as MarketBatchEvents of up to batch_size ticks.
+
+        Strategies with an on_market_batch(batch) hook get the whole batch
+        and return an iterable of SignalEvents (or None); quotes and marks
+        are applied for each symbol's last tick in the batch first. The
+        hook's signals are re-stamped with the batch's last tick time, and
+        their orders are priced against the end-of-batch quotes, so a
+        decision never fills earlier than the data it was based on (use a
+        smaller batch_size for finer decision times). Other
+        strategies get per-tick on_market_event() calls, exactly as in
+        run_from_datahandler.
+        """
+        self.running = True
+        registry = datahandler.registry
+        tz_utc = getattr(datahandler, "tz_utc", False)
+        has_hook = hasattr(self.strategy, "on_market_batch")
+        rows = 0
+
+        while self.running:
+            size = batch_size if max_rows is None else min(batch_size, max_rows - rows)
+            if size <= 0:
+                break
+            cols = datahandler.stream_batch(size)
+            if cols is None:
+                break
+
+            batch = MarketBatchEvent(
+                symbols=registry.symbols,
+                symbol_id=cols["symbol_id"],
+                timestamp=cols["timestamp"],
+                bid=cols["bid"],
+                ask=cols["ask"],
+                last=cols["last"],
+                volume=cols["volume"],
+                tz_utc=tz_utc,
+            )
+            if has_hook:
+                self._put(batch)
+                self._drain()
+            else:
+                # Fallback: per tick, each tick's cascade drained before the next
+                for tick in batch.ticks():
+                    self._put(tick)
+                    self._drain()
+            rows += len(batch)
+
+        self._release_pending()
+        self.event_log.close()
+        if print_summary:
+            print("Engine stopped.")
+            print("Portfolio snapshot:", self.portfolio.snapshot())
@@ -0,0 +1,233 @@
+# src/core/event_log.py
+
+import json
+import struct
+from collections import deque
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.events import MARKET, SIGNAL, ORDER, FILL
+from src.core.timeutil import NAT, to_ns
+
+
+class EventLog:
+    """
+    Event-log sink interface used by SimpleEngine for SIGNAL / ORDER / FILL.
+
+    record(event, price) is called on the engine hot path, so sinks should
+    only buffer there and do I/O in flush(). price is the expected fill
+    price for ORDER events, None otherwise. Sinks with enabled=False are
+    never called at all.
+    """
+    enabled = True
+
+    def record(self, event, price: Optional[float] = None):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class NullEventLog(EventLog):
+    """
+    Quiet mode: the engine skips logging entirely.
+    """
+    enabled = False
+
+    def record(self, event, price: Optional[float] = None):
+        pass
+
+
+class PrintEventLog(EventLog):
+    """
+    Human-readable lines on stdout (the engine's historical output).
+    Unbuffered; use for small runs and debugging.
+    """
+
+    def record(self, event, price: Optional[float] = None):
+        print(format_event(event, price))
+
+
+class RingBufferEventLog(EventLog):
+    """
+    Keeps the last `capacity` (event, price) pairs in memory; older entries
+    are dropped. Events are stored as-is, so recording costs one append.
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.buffer = deque(maxlen=capacity)
+
+    def record(self, event, price: Optional[float] = None):
+        self.buffer.append((event, price))
+
+    def events(self) -> List[Any]:
+        return [e for e, _ in self.buffer]
+
+    def lines(self) -> List[str]:
+        return [format_event(e, p) for e, p in self.buffer]
+
+
+class FileEventLog(EventLog):
+    """
+    Buffered file sink. Events are kept in memory and written in one
+    batch every `buffer_events` events (and on flush()/close()).
+
+    fmt="jsonl": one JSON object per line
+    fmt="binary": fixed-layout records, see BINARY_RECORD / read_binary_log()
+
+    The file is created (truncated) up front but only held open while
+    there is something to write: close() releases it (SimpleEngine calls
+    it when a run ends), and a later write reopens it in append mode.
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl", buffer_events: int = 4096):
+        if fmt not in ("jsonl", "binary"):
+            raise ValueError(f"Unknown event log format: {fmt}")
+        if buffer_events <= 0:
+            raise ValueError("buffer_events must be > 0")
+        self.path = path
+        self.fmt = fmt
+        self.buffer_events = buffer_events
+        self._pending = []
+        open(path, "wb").close()
+        self._file = None
+        self._encode = _encode_jsonl if fmt == "jsonl" else _encode_binary
+
+    def record(self, event, price: Optional[float] = None):
+        self._pending.append((event, price))
+        if len(self._pending) >= self.buffer_events:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            encode = self._encode
+            self._file.write(b"".join(encode(e, p) for e, p in self._pending))
+            self._pending.clear()
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------
+# Formatting / encoding
+# -----------------------
+def format_event(event, price: Optional[float] = None) -> str:
+    if event.kind == SIGNAL:
+        return (
+            f"[SIGNAL] {event.timestamp} {event.symbol} "
+            f"{event.signal_type} strength={event.strength}"
+        )
+    if event.kind == ORDER:
+        line = (
+            f"[ORDER]  {event.timestamp} {event.symbol} "
+            f"{event.direction} qty={event.quantity} type={event.order_type}"
+        )
+        if event.price is not None:
+            line += f" limit={event.price:.2f}"
+        if price is not None:
+            line += f" fill_px~{price:.2f}"
+        return line
+    if event.kind == FILL:
+        return (
+            f"[FILL]   {event.timestamp} {event.symbol} "
+            f"{event.direction} qty={event.quantity} px={event.fill_price:.2f} "
+            f"comm={event.commission:.2f}"
+        )
+    return f"[{event.type}] {event.timestamp} {event.symbol}"
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _encode_jsonl(event, price: Optional[float]) -> bytes:
+    rec = {"type": event.type}
+    for f in fields(event):
+        rec[f.name] = getattr(event, f.name)
+    if price is not None:
+        rec["expected_price"] = price
+    return (json.dumps(rec, default=_json_default) + "\n").encode("utf-8")
+
+
+# kind, side, timestamp (int64 ns since epoch UTC, naive = UTC as in
+# to_ns(); NaT if unknown), quantity, price (signal strength / expected
+# order price / fill price), commission, symbol length; followed by the
+# utf-8 symbol bytes
+BINARY_RECORD = struct.Struct("<BBqqddH")
+_SIDES = {None: 0, "BUY": 1, "SELL": 2, "EXIT": 3}
+_SIDE_NAMES = {v: k for k, v in _SIDES.items()}
+
+
+def _encode_binary(event, price: Optional[float]) -> bytes:
+    kind = event.kind
+    ts = to_ns(event.timestamp) if isinstance(event.timestamp, datetime) else NAT
+    qty = 0
+    commission = 0.0
+    if kind == SIGNAL:
+        side = event.signal_type
+        px = event.strength
+    elif kind == ORDER:
+        side = event.direction
+        qty = event.quantity
+        px = price if price is not None else float("nan")
+    elif kind == FILL:
+        side = event.direction
+        qty = event.quantity
+        px = event.fill_price
+        commission = event.commission
+    else:
+        side = None
+        px = float("nan")
+
+    sym = str(event.symbol).encode("utf-8")
+    return BINARY_RECORD.pack(kind, _SIDES.get(side, 0), ts, qty, px, commission, len(sym)) + sym
+
+
+_KIND_NAMES = {MARKET: "MARKET", SIGNAL: "SIGNAL", ORDER: "ORDER", FILL: "FILL"}
+
+
+def read_binary_log(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Decode a fmt="binary" event log back into dicts ("timestamp" is int64
+    ns since epoch UTC, None if unknown).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    pos = 0
+    size = BINARY_RECORD.size
+    while pos < len(data):
+        kind, side, ts, qty, px, commission, n = BINARY_RECORD.unpack_from(data, pos)
+        pos += size
+        symbol = data[pos:pos + n].decode("utf-8")
+        pos += n
+        yield {
+            "type": _KIND_NAMES.get(kind, str(kind)),
+            "timestamp": None if ts == NAT else ts,
+            "symbol": symbol,
+            "side": _SIDE_NAMES.get(side),
+            "quantity": qty,
+            "price": px,
+            "commission": commission,
+        }
@@ -2,22 +2,41 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Integer event tags, usable as list indices for dispatch
+MARKET = 0
+SIGNAL = 1
+ORDER = 2
+FILL = 3
+MARKET_BATCH = 4
 
 
 class Event:
     """
     Base class for all events.
-    Every event has a 'type' so the event loop can route it.
+    Every event class has a class-level 'type' string and integer 'kind'
+    tag so the event loop can route it; instances carry no per-event tag
+    and, being slotted, no __dict__.
     """
-    type: str
+    __slots__ = ()
 
+    type: ClassVar[str]
+    kind: ClassVar[int]
 
-@dataclass
+
+@dataclass(slots=True)
 class MarketEvent(Event):
     """
     Represents new market data (tick / quote / bar).
     """
+    type: ClassVar[str] = "MARKET"
+    kind: ClassVar[int] = MARKET
+
     symbol: str
     timestamp: datetime
     bid: float
@@ -25,53 +44,124 @@ class MarketEvent(Event):
     last: Optional[float] = None
     volume: Optional[int] = None
 
-    def __post_init__(self):
-        self.type = "MARKET"
 
-
-@dataclass
+@dataclass(slots=True)
 class SignalEvent(Event):
     """
     Strategy-generated signal.
     Example: BUY/SELL with optional strength.
     """
+    type: ClassVar[str] = "SIGNAL"
+    kind: ClassVar[int] = SIGNAL
+
     symbol: str
     timestamp: datetime
     signal_type: str  # "BUY" or "SELL" or "EXIT"
     strength: float = 1.0  # confidence / size multiplier
 
-    def __post_init__(self):
-        self.type = "SIGNAL"
 
-
-@dataclass
+@dataclass(slots=True)
 class OrderEvent(Event):
     """
     Order sent to execution layer.
     """
+    type: ClassVar[str] = "ORDER"
+    kind: ClassVar[int] = ORDER
+
     symbol: str
     timestamp: datetime
-    order_type: str   # "MKT" or "LMT"
+    order_type: str   # "MKT", "LMT" or "CXL" (cancel order_id)
     direction: str    # "BUY" or "SELL"
     quantity: int
     price: Optional[float] = None  # needed for limit orders
+    order_id: Optional[int] = None  # assigned by the execution layer if None
+    venue: Optional[str] = None     # routing venue (fee schedule), None = default
 
     def __post_init__(self):
-        self.type = "ORDER"
+        if self.order_type == "LMT" and self.price is None:
+            raise ValueError("LMT order needs a price")
+        if self.order_type == "CXL" and self.order_id is None:
+            raise ValueError("CXL order needs the order_id to cancel")
 
 
-@dataclass
+@dataclass(slots=True)
 class FillEvent(Event):
     """
     Fill returned from execution layer.
     Includes fees, price, quantity, etc.
     """
+    type: ClassVar[str] = "FILL"
+    kind: ClassVar[int] = FILL
+
     symbol: str
     timestamp: datetime
     direction: str
     quantity: int
     fill_price: float
     commission: float = 0.0
+    order_id: Optional[int] = None
+    liquidity: Optional[str] = None  # "MAKER" (resting limit) or "TAKER"
 
-    def __post_init__(self):
-        self.type = "FILL"
+
+@dataclass(slots=True)
+class MarketBatchEvent(Event):
+    """
+    A time-ordered slice of ticks as parallel NumPy arrays (struct of
+    arrays), for strategies that implement on_market_batch().
+
+    symbol_id indexes into `symbols`; timestamp is datetime64[ns] UTC;
+    volume is -1 where missing.
+    """
+    type: ClassVar[str] = "MARKET_BATCH"
+    kind: ClassVar[int] = MARKET_BATCH
+
+    symbols: List[str]
+    symbol_id: np.ndarray
+    timestamp: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    last: np.ndarray
+    volume: np.ndarray
+    tz_utc: bool = False  # yield UTC-aware datetimes from ticks()
+
+    def __len__(self) -> int:
+        return len(self.symbol_id)
+
+    def rows(self, lo: int, hi: int) -> "MarketBatchEvent":
+        """
+        Ticks [lo, hi) as a batch (array views, no copy).
+        """
+        return MarketBatchEvent(
+            symbols=self.symbols,
+            symbol_id=self.symbol_id[lo:hi],
+            timestamp=self.timestamp[lo:hi],
+            bid=self.bid[lo:hi],
+            ask=self.ask[lo:hi],
+            last=self.last[lo:hi],
+            volume=self.volume[lo:hi],
+            tz_utc=self.tz_utc,
+        )
+
+    def ticks(self) -> Iterator[MarketEvent]:
+        """
+        Unpack into per-tick MarketEvents (for strategies without a batch
+        hook).
+        """
+        names = self.symbols
+        stamps = pd.to_datetime(self.timestamp, utc=self.tz_utc).to_pydatetime()
+        for ts, sid, bid, ask, last, vol in zip(
+            stamps,
+            self.symbol_id.tolist(),
+            self.bid.tolist(),
+            self.ask.tolist(),
+            self.last.tolist(),
+            self.volume.tolist(),
+        ):
+            yield MarketEvent(
+                symbol=names[sid],
+                timestamp=ts,
+                bid=bid,
+                ask=ask,
+                last=last,
+                volume=vol if vol >= 0 else None,
+            )
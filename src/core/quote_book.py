@@ -0,0 +1,76 @@
+# src/core/quote_book.py
+
+from typing import Optional
+
+import numpy as np
+
+from src.core.symbols import SymbolArrays
+
+
+NAN = float("nan")
+
+
+class QuoteBook(SymbolArrays):
+    """
+    Latest bid / ask / last / volume per symbol, in arrays indexed by
+    symbol ID. Missing values are NaN.
+    """
+
+    FIELDS = {
+        "bid": ("f8", np.nan),
+        "ask": ("f8", np.nan),
+        "last": ("f8", np.nan),
+        "volume": ("f8", np.nan),
+        "has_quote": ("?", False),
+    }
+
+    def update(self, sid: int, bid, ask, last, volume=None):
+        sc = self.scalars
+        sc["bid"][sid] = NAN if bid is None else float(bid)
+        sc["ask"][sid] = NAN if ask is None else float(ask)
+        sc["last"][sid] = NAN if last is None else float(last)
+        sc["volume"][sid] = NAN if volume is None else float(volume)
+        sc["has_quote"][sid] = True
+
+    def update_many(self, sids: np.ndarray, bid: np.ndarray, ask: np.ndarray, last: np.ndarray,
+                    volume: np.ndarray = None):
+        """
+        Vectorized update; with repeated IDs the last occurrence wins.
+        volume < 0 (the columnar handlers' missing marker) is stored as NaN.
+        """
+        self.bid[sids] = bid
+        self.ask[sids] = ask
+        self.last[sids] = last
+        self.volume[sids] = np.nan if volume is None else np.where(volume >= 0, volume, np.nan)
+        self.has_quote[sids] = True
+
+    def get(self, symbol: str) -> Optional[dict]:
+        """
+        Quote as {"bid", "ask", "last"} (None where missing), or None if the
+        symbol has never been quoted.
+        """
+        sid = self.registry.get(symbol)
+        if sid is None or sid >= self.capacity or not self.has_quote[sid]:
+            return None
+        return {
+            name: (None if np.isnan(v) else v)
+            for name, v in (
+                ("bid", float(self.bid[sid])),
+                ("ask", float(self.ask[sid])),
+                ("last", float(self.last[sid])),
+            )
+        }
+
+    def mid(self, sid: int) -> Optional[float]:
+        """
+        Mid if both sides are known, else last, else None.
+        """
+        bid = self.bid[sid]
+        ask = self.ask[sid]
+        if bid == bid and ask == ask:  # neither is NaN
+            return float((bid + ask) / 2.0)
+        last = self.last[sid]
+        return None if last != last else float(last)
+
+    def to_dict(self) -> dict:
+        return {sym: self.get(sym) for sym in self.registry.symbols if self.get(sym) is not None}
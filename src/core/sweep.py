@@ -0,0 +1,177 @@
+# src/core/sweep.py
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.core.engine import SimpleEngine
+from src.core.event_log import NullEventLog
+from src.core.tick_store import TickStore, TickStoreDataHandler, convert_csv, load_index
+from src.execution.execution_sim import ExecutionSimulator
+from src.portfolio.portfolio import Portfolio
+from src.strategies.dummy_strat import DummyStrategy
+
+
+# -----------------------
+# Parameter sets
+# -----------------------
+def param_grid(**values: Sequence) -> List[Dict[str, Any]]:
+    """
+    Full grid: param_grid(sma_window=[10, 20], ema_period=[5, 10]) gives
+    the four combinations, in itertools.product order.
+    """
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values.values())]
+
+
+def random_params(n: int, seed: Optional[int] = None, **ranges) -> List[Dict[str, Any]]:
+    """
+    n random parameter sets. Each range is a list (uniform choice) or an
+    (lo, hi) tuple: integers drawn from [lo, hi], floats from [lo, hi).
+    """
+    rng = np.random.default_rng(seed)
+    cols = {}
+    for name, spec in ranges.items():
+        if isinstance(spec, tuple):
+            lo, hi = spec
+            if isinstance(lo, int) and isinstance(hi, int):
+                cols[name] = rng.integers(lo, hi + 1, n).tolist()
+            else:
+                cols[name] = rng.uniform(lo, hi, n).tolist()
+        else:
+            cols[name] = [spec[i] for i in rng.integers(0, len(spec), n)]
+    return [{name: cols[name][i] for name in cols} for i in range(n)]
+
+
+def ensure_tick_store(csv_path: str, ticks_path: Optional[str] = None) -> str:
+    """
+    Path of the binary tick store for csv_path (".ticks" next to it),
+    converting once if it is missing or older than the CSV.
+    """
+    if ticks_path is None:
+        ticks_path = os.path.splitext(csv_path)[0] + ".ticks"
+    if not os.path.exists(ticks_path) or os.path.getmtime(ticks_path) < os.path.getmtime(csv_path):
+        convert_csv(csv_path, ticks_path)
+    return ticks_path
+
+
+# -----------------------
+# Worker side
+# -----------------------
+def _summary(portfolio: Portfolio) -> Dict[str, float]:
+    nav = portfolio.history.column("nav")
+    initial = portfolio.initial_capital
+    if len(nav):
+        peak = np.maximum.accumulate(np.maximum(nav, initial))
+        max_dd = float(np.max((peak - nav) / peak))
+        # Mean over std of mark-to-mark returns, not annualized
+        rets = np.diff(nav) / nav[:-1]
+        std = float(rets.std()) if len(rets) > 1 else 0.0
+        sharpe = float(rets.mean() / std) if std > 0 else 0.0
+    else:
+        max_dd = sharpe = 0.0
+
+    return {
+        "nav": portfolio.nav,
+        "total_return": portfolio.nav / initial - 1.0,
+        "realized_pnl": portfolio.realized_pnl,
+        "unrealized_pnl": portfolio.unrealized_pnl,
+        "commission": portfolio.total_commission,
+        "fills": len(portfolio.history.position_deltas()),
+        "max_drawdown": max_dd,
+        "sharpe_per_mark": sharpe,
+    }
+
+
+def run_one(
+    ticks_path: str,
+    params: Dict[str, Any],
+    strategy_cls=DummyStrategy,
+    portfolio_kwargs: Optional[Dict[str, Any]] = None,
+    execution_kwargs: Optional[Dict[str, Any]] = None,
+    handler_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    One backtest over the tick store with its own engine, portfolio and
+    execution simulator; returns params plus summary metrics.
+    """
+    t0 = time.perf_counter()
+    portfolio = Portfolio(**(portfolio_kwargs or {}))
+    execution = ExecutionSimulator(**(execution_kwargs or {}))
+    strategy = strategy_cls(portfolio=portfolio, **params)
+    engine = SimpleEngine(strategy, portfolio, execution, event_log=NullEventLog())
+
+    # The memmap is shared through the page cache: no per-worker parsing
+    dh = TickStoreDataHandler(ticks_path, **(handler_kwargs or {}))
+    engine.run_from_datahandler(dh, print_summary=False)
+
+    row = dict(params)
+    row.update(_summary(portfolio))
+    row["seconds"] = time.perf_counter() - t0
+    return row
+
+
+def _run_task(args):
+    return run_one(*args)
+
+
+# -----------------------
+# Driver
+# -----------------------
+def run_sweep(
+    data_path: str,
+    param_sets: Sequence[Dict[str, Any]],
+    workers: Optional[int] = None,
+    strategy_cls=DummyStrategy,
+    portfolio_kwargs: Optional[Dict[str, Any]] = None,
+    execution_kwargs: Optional[Dict[str, Any]] = None,
+    handler_kwargs: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Backtest every parameter set and collect one summary row each.
+
+    data_path: a binary tick store, or a CSV (converted once to a tick
+    store next to it). Workers memory-map the same file, so the data is
+    loaded once and shared by all processes.
+
+    param_sets: strategy keyword arguments, e.g. from param_grid() or
+    random_params(). portfolio / execution / handler kwargs are passed to
+    Portfolio, ExecutionSimulator and TickStoreDataHandler (start, end,
+    symbols) in every run. strategy_cls must be importable (picklable).
+
+    Result columns include max_drawdown and sharpe_per_mark (mean / std
+    of mark-to-mark NAV returns, not annualized).
+
+    workers: process count (default os.cpu_count()); 1 runs in-process.
+    Runs are independent, so wall time scales with cores until the runs
+    run out.
+    """
+    if not data_path.endswith(".ticks"):
+        data_path = ensure_tick_store(data_path)
+
+    # A replay window goes through the sidecar index: build it here once,
+    # so workers only read it instead of all writing it at the same time
+    hk = handler_kwargs or {}
+    if any(hk.get(k) is not None for k in ("start", "end", "symbols")):
+        load_index(TickStore(data_path))
+
+    tasks = [
+        (data_path, params, strategy_cls, portfolio_kwargs, execution_kwargs, handler_kwargs)
+        for params in param_sets
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        rows = [_run_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    return pd.DataFrame(rows)
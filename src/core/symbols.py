@@ -0,0 +1,121 @@
+# src/core/symbols.py
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SymbolRegistry:
+    """
+    Interns ticker strings to dense integer IDs (0, 1, 2, ...).
+
+    IDs are assigned in first-seen order and never change, so they can be
+    used to index per-symbol arrays and stored in binary tick files.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        # get(symbol, default=None) -> ID or default: the dict's own get,
+        # so per-tick lookups cost no extra Python call
+        self.get = self._ids.get
+        for sym in symbols:
+            self.intern(sym)
+
+    def intern(self, symbol: str) -> int:
+        """
+        Return the ID for symbol, assigning the next free one if new.
+        """
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def intern_many(self, symbols) -> np.ndarray:
+        """
+        Vectorized intern() for a whole column. Returns an int32 ID array.
+        """
+        codes, uniques = pd.factorize(np.asarray(symbols, dtype=object))
+        ids = np.array([self.intern(u) for u in uniques], dtype=np.int32)
+        return ids[codes]
+
+    def id_of(self, symbol: str) -> int:
+        return self._ids[symbol]
+
+    def name(self, sid: int) -> str:
+        return self.symbols[sid]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._ids
+
+
+class SymbolArrays:
+    """
+    Base for per-symbol state held in contiguous NumPy arrays indexed by
+    SymbolRegistry ID. Subclasses declare FIELDS = {name: (dtype, fill)};
+    each field becomes an array attribute, grown (doubling) as new symbols
+    are interned. Entries of symbols not yet seen hold the fill value.
+
+    `scalars` maps each field to a memoryview of its array, for per-tick
+    code touching one element: memoryview indexing is several times
+    cheaper than NumPy scalar indexing and reads back Python numbers.
+    Whole-book work should use the arrays.
+    """
+
+    FIELDS: Dict[str, Tuple[str, object]] = {}
+
+    def __init__(self, registry: Optional[SymbolRegistry] = None, capacity: int = 64):
+        self.registry = registry if registry is not None else SymbolRegistry()
+        self.capacity = max(capacity, len(self.registry), 1)
+        for name, (dtype, fill) in self.FIELDS.items():
+            setattr(self, name, np.full(self.capacity, fill, dtype=dtype))
+        self.scalars = {name: memoryview(getattr(self, name)) for name in self.FIELDS}
+
+    def _grow(self, sid: int):
+        cap = self.capacity
+        while cap <= sid:
+            cap *= 2
+        for name, (dtype, fill) in self.FIELDS.items():
+            old = getattr(self, name)
+            new = np.full(cap, fill, dtype=dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = cap
+        self.scalars = {name: memoryview(getattr(self, name)) for name in self.FIELDS}
+
+    def sid(self, symbol: str) -> int:
+        """
+        Registry ID for symbol (interning it if new), with arrays sized to fit.
+        """
+        # Fast path (known symbol, arrays large enough): one dict lookup
+        sid = self.registry.get(symbol)
+        if sid is None:
+            sid = self.registry.intern(symbol)
+        if sid >= self.capacity:
+            self._grow(sid)
+        return sid
+
+    def sids(self, symbols) -> np.ndarray:
+        """
+        Vectorized sid() for an array of tickers.
+        """
+        ids = self.registry.intern_many(symbols)
+        if len(self.registry) > self.capacity:
+            self._grow(len(self.registry) - 1)
+        return ids
+
+    def ensure_capacity(self):
+        if len(self.registry) > self.capacity:
+            self._grow(len(self.registry) - 1)
+
+    def view(self, name: str) -> np.ndarray:
+        """
+        Field array trimmed to the symbols interned so far.
+        """
+        return getattr(self, name)[:len(self.registry)]
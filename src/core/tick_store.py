@@ -0,0 +1,432 @@
+# src/core/tick_store.py
+
+import argparse
+import os
+import struct
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_handler import frame_columns
+from src.core.symbols import SymbolRegistry
+
+
+# -----------------------
+# File format
+# -----------------------
+# [header: 64 bytes][records: n_records * TICK_DTYPE][symbol table: utf-8, "\n"-separated]
+#
+# Records are fixed width and time-sorted. Timestamps are int64 ns since
+# epoch (UTC); volume is -1 when missing; sym is an index into the symbol
+# table.
+MAGIC = b"HFTCTICK"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ")  # magic, version, flags, n_records, n_symbols, symtab_offset
+HEADER_SIZE = 64
+FLAG_TZ_UTC = 1  # source timestamps were tz-aware (yield UTC datetimes)
+
+TICK_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("sym", "<u4"),
+    ("last", "<f8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("volume", "<i8"),
+])
+
+
+def _records_from_columns(cols: Dict[str, np.ndarray], registry: SymbolRegistry) -> np.ndarray:
+    rec = np.empty(len(cols["last"]), dtype=TICK_DTYPE)
+    rec["ts"] = cols["timestamp"].view("i8")
+    rec["sym"] = registry.intern_many(cols["symbol"])
+    rec["last"] = cols["last"]
+    rec["bid"] = cols["bid"]
+    rec["ask"] = cols["ask"]
+    rec["volume"] = np.where(cols["has_volume"], cols["volume"], -1)
+    return rec
+
+
+def convert_csv(csv_path: str, out_path: str, presorted: bool = False, chunk_size: int = 1_000_000) -> int:
+    """
+    One-time conversion of a tick CSV (timestamp, symbol, last[, bid, ask,
+    volume]) to the binary tick format. Returns the number of records.
+
+    presorted=False loads the whole file and sorts it by time (stable).
+    presorted=True streams the file in chunks and raises ValueError if it
+    is not already in timestamp order.
+    """
+    registry = SymbolRegistry()
+    n_records = 0
+    tz_aware = None
+    prev_ts = None
+
+    with open(out_path, "wb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+
+        if presorted:
+            frames = pd.read_csv(csv_path, chunksize=chunk_size)
+        else:
+            frames = [pd.read_csv(csv_path)]
+
+        for df in frames:
+            cols = frame_columns(df)
+            if tz_aware is None and len(df):
+                tz_aware = cols["ts_obj"][0].tzinfo is not None
+            if not presorted:
+                order = np.argsort(cols["timestamp"], kind="stable")
+                cols = {k: v[order] for k, v in cols.items()}
+
+            rec = _records_from_columns(cols, registry)
+            if len(rec):
+                ts = rec["ts"]
+                if (prev_ts is not None and ts[0] < prev_ts) or np.any(ts[1:] < ts[:-1]):
+                    raise ValueError(f"CSV not sorted by timestamp: {csv_path}")
+                prev_ts = ts[-1]
+
+            f.write(rec.tobytes())
+            n_records += len(rec)
+
+        symtab_offset = f.tell()
+        f.write("\n".join(registry.symbols).encode("utf-8"))
+
+        flags = FLAG_TZ_UTC if tz_aware else 0
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, flags, n_records, len(registry), symtab_offset))
+
+    return n_records
+
+
+class TickStore:
+    """
+    Read-only, memory-mapped view of a binary tick file.
+
+    `records` is a structured np.memmap (fields: ts, sym, last, bid, ask,
+    volume); slicing it never copies. `registry` maps symbol IDs back to
+    tickers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Not a tick file (truncated header): {path}")
+            magic, version, flags, n_records, n_symbols, symtab_offset = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Not a tick file (bad magic): {path}")
+            if version != VERSION:
+                raise ValueError(f"Unsupported tick file version {version}: {path}")
+            f.seek(symtab_offset)
+            symtab = f.read().decode("utf-8")
+
+        names = symtab.split("\n") if n_symbols else []
+        if len(names) != n_symbols:
+            raise ValueError(f"Corrupt symbol table: {path}")
+
+        self.registry = SymbolRegistry(names)
+        self.tz_utc = bool(flags & FLAG_TZ_UTC)
+        if n_records:
+            self.records = np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n_records,))
+        else:
+            self.records = np.empty(0, dtype=TICK_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def symbols(self):
+        return self.registry.symbols
+
+    def to_datetimes(self, ts_ns: np.ndarray) -> np.ndarray:
+        """
+        Convert int64 ns timestamps to datetime objects, matching what the
+        CSV handlers yield (UTC-aware if the source CSV was tz-aware).
+        """
+        idx = pd.to_datetime(ts_ns, unit="ns", utc=self.tz_utc)
+        return idx.to_pydatetime()
+
+
+# -----------------------
+# Sidecar index
+# -----------------------
+def index_path(path: str) -> str:
+    return path + ".idx.npz"
+
+
+class TickIndex:
+    """
+    Sidecar index for a tick file, stored next to it as <path>.idx.npz:
+    - ts_keys / ts_rows: each distinct timestamp and the first row holding it
+    - sym_offsets / sym_rows: row numbers grouped by symbol ID (CSR layout),
+      ascending within each symbol
+
+    Records are fixed width, so a row number is a direct seek offset into
+    the memory map. `fingerprint` identifies the tick file the index was
+    built from (see file_fingerprint()).
+    """
+
+    def __init__(self, n_records: int, ts_keys, ts_rows, sym_offsets, sym_rows, fingerprint=None):
+        self.n_records = n_records
+        self.fingerprint = fingerprint
+        self.ts_keys = ts_keys
+        self.ts_rows = ts_rows
+        self.sym_offsets = sym_offsets
+        self.sym_rows = sym_rows
+
+    @classmethod
+    def build(cls, store: "TickStore") -> "TickIndex":
+        ts = np.asarray(store.records["ts"])
+        sym = np.asarray(store.records["sym"])
+
+        first = np.flatnonzero(np.r_[True, ts[1:] != ts[:-1]]) if len(ts) else np.empty(0, np.int64)
+        sym_rows = np.argsort(sym, kind="stable").astype(np.int64)
+        counts = np.bincount(sym, minlength=len(store.registry))
+        sym_offsets = np.r_[0, np.cumsum(counts)].astype(np.int64)
+
+        return cls(len(ts), ts[first], first.astype(np.int64), sym_offsets, sym_rows, file_fingerprint(store))
+
+    def save(self, path: str):
+        """
+        Write atomically (temp file in the same directory, then
+        os.replace), so concurrent readers never see a partial index.
+        """
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    n_records=np.int64(self.n_records),
+                    ts_keys=self.ts_keys,
+                    ts_rows=self.ts_rows,
+                    sym_offsets=self.sym_offsets,
+                    sym_rows=self.sym_rows,
+                    fingerprint=np.asarray(self.fingerprint, dtype=np.int64),
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "TickIndex":
+        with np.load(path) as z:
+            fingerprint = tuple(z["fingerprint"].tolist()) if "fingerprint" in z else None
+            return cls(int(z["n_records"]), z["ts_keys"], z["ts_rows"], z["sym_offsets"], z["sym_rows"], fingerprint)
+
+    def row_range(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None):
+        """
+        Rows [lo, hi) with start_ns <= ts < end_ns, by binary search.
+        """
+        lo = 0
+        hi = self.n_records
+        if start_ns is not None:
+            k = np.searchsorted(self.ts_keys, start_ns, side="left")
+            lo = int(self.ts_rows[k]) if k < len(self.ts_keys) else self.n_records
+        if end_ns is not None:
+            k = np.searchsorted(self.ts_keys, end_ns, side="left")
+            hi = int(self.ts_rows[k]) if k < len(self.ts_keys) else self.n_records
+        return lo, max(lo, hi)
+
+    def symbol_rows(self, sid: int, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """
+        Rows of symbol `sid` within [lo, hi).
+        """
+        rows = self.sym_rows[self.sym_offsets[sid]:self.sym_offsets[sid + 1]]
+        if hi is None:
+            hi = self.n_records
+        a, b = np.searchsorted(rows, [lo, hi])
+        return rows[a:b]
+
+
+def file_fingerprint(store: "TickStore") -> tuple:
+    """
+    (size, mtime_ns, n_records, n_symbols, first ts, last ts) of a tick
+    file: changes whenever the file is rewritten, even with the same
+    number of rows.
+    """
+    st = os.stat(store.path)
+    ts = store.records["ts"]
+    first, last = (int(ts[0]), int(ts[-1])) if len(ts) else (0, 0)
+    return (st.st_size, st.st_mtime_ns, len(store), len(store.registry), first, last)
+
+
+def load_index(store: "TickStore", rebuild: bool = False) -> TickIndex:
+    """
+    Load the sidecar index of a tick file, building and saving it first if
+    it is missing, unreadable, built from another version of the file
+    (fingerprint mismatch) or rebuild=True.
+    """
+    path = index_path(store.path)
+    if not rebuild:
+        try:
+            idx = TickIndex.load(path)
+            if idx.fingerprint == file_fingerprint(store):
+                return idx
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            pass
+
+    idx = TickIndex.build(store)
+    idx.save(path)
+    return idx
+
+
+def _to_utc_ns(ts) -> int:
+    t = pd.Timestamp(ts)
+    if t.tzinfo is not None:
+        t = t.tz_convert("UTC").tz_localize(None)
+    return t.as_unit("ns").value
+
+
+class TickStoreDataHandler:
+    """
+    Drop-in DataHandler over a binary tick file:
+    - No parsing: records are read straight from the memory map
+    - stream_next() yields the same row dicts as CSVDataHandler
+    - stream_batch() yields field views (symbol as integer IDs, missing
+      volume as -1)
+
+    Optional replay window:
+    - start / end: replay only start <= timestamp < end
+    - symbols: replay only these tickers
+
+    A window is resolved through the sidecar index (built on first use), so
+    replay seeks straight to the selected rows instead of scanning. Naive
+    start/end are read on the same clock as the stored (UTC) timestamps.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        row_chunk: int = 65_536,
+        start=None,
+        end=None,
+        symbols: Optional[Sequence[str]] = None,
+    ):
+        if row_chunk <= 0:
+            raise ValueError("row_chunk must be > 0")
+        self.store = TickStore(path)
+        self.row_chunk = row_chunk
+
+        self._rows = self._select_rows(start, end, symbols)
+        self._pos = 0
+        self._iter = self._row_iterator(0)
+
+    def _select_rows(self, start, end, symbols):
+        """
+        A slice for a plain time window (zero-copy), or a sorted row-number
+        array when a symbol subset is requested.
+        """
+        if start is None and end is None and symbols is None:
+            return slice(0, len(self.store))
+
+        idx = load_index(self.store)
+        lo, hi = idx.row_range(
+            _to_utc_ns(start) if start is not None else None,
+            _to_utc_ns(end) if end is not None else None,
+        )
+        if symbols is None:
+            return slice(lo, hi)
+
+        parts = [
+            idx.symbol_rows(self.registry.id_of(sym), lo, hi)
+            for sym in symbols
+            if sym in self.registry
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts), kind="stable")
+
+    def _take(self, start: int, stop: int) -> np.ndarray:
+        rows = self._rows
+        if isinstance(rows, slice):
+            return self.store.records[rows.start + start:rows.start + stop]
+        return self.store.records[rows[start:stop]]
+
+    @property
+    def registry(self) -> SymbolRegistry:
+        return self.store.registry
+
+    @property
+    def tz_utc(self) -> bool:
+        return self.store.tz_utc
+
+    def __len__(self) -> int:
+        rows = self._rows
+        if isinstance(rows, slice):
+            return rows.stop - rows.start
+        return len(rows)
+
+    def _row_iterator(self, first: int) -> Iterator[Dict[str, Any]]:
+        names = self.store.symbols
+        n = len(self)
+
+        for start in range(first, n, self.row_chunk):
+            chunk = self._take(start, min(start + self.row_chunk, n))
+            for ts, sid, bid, ask, last, vol in zip(
+                self.store.to_datetimes(chunk["ts"]),
+                chunk["sym"].tolist(),
+                chunk["bid"].tolist(),
+                chunk["ask"].tolist(),
+                chunk["last"].tolist(),
+                chunk["volume"].tolist(),
+            ):
+                self._pos += 1
+                yield {
+                    "timestamp": ts,
+                    "symbol": names[sid],
+                    "bid": bid,
+                    "ask": ask,
+                    "last": last,
+                    "volume": vol if vol >= 0 else None
+                }
+
+    def stream_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns next market row dict, or None if data exhausted.
+        """
+        try:
+            return next(self._iter)
+        except StopIteration:
+            return None
+
+    def stream_batch(self, size: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the next `size` records as a dict of field arrays, or None
+        if data exhausted. Shares the read position with stream_next().
+        Without a symbol subset these are memmap views (no copies).
+        """
+        if size <= 0:
+            raise ValueError("size must be > 0")
+        start = self._pos
+        if start >= len(self):
+            return None
+        stop = min(start + size, len(self))
+
+        self._pos = stop
+        self._iter = self._row_iterator(stop)
+
+        chunk = self._take(start, stop)
+        return {
+            "timestamp": chunk["ts"].view("datetime64[ns]"),
+            "symbol_id": chunk["sym"],
+            "bid": chunk["bid"],
+            "ask": chunk["ask"],
+            "last": chunk["last"],
+            "volume": chunk["volume"],
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a tick CSV to the binary tick format.")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_path")
+    parser.add_argument("--presorted", action="store_true",
+                        help="stream in chunks; the CSV must already be time-sorted")
+    args = parser.parse_args()
+
+    n = convert_csv(args.csv_path, args.out_path, presorted=args.presorted)
+    print(f"Wrote {n} ticks to {args.out_path}")
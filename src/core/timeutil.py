@@ -0,0 +1,40 @@
+# src/core/timeutil.py
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAT = np.iinfo(np.int64).min  # int64 view of NaT
+
+
+def to_ns(ts) -> int:
+    """
+    Timestamp -> int64 ns since epoch. Aware values are converted to UTC;
+    naive values are taken as UTC wall time (as pandas does). None -> NaT.
+    """
+    if ts is None:
+        return NAT
+    if isinstance(ts, pd.Timestamp):
+        return ts.value
+    if isinstance(ts, datetime):
+        d = ts - (_EPOCH if ts.tzinfo is None else _EPOCH_UTC)
+        return (d.days * 86_400 + d.seconds) * 1_000_000_000 + d.microseconds * 1_000
+    return pd.Timestamp(ts).value
+
+
+def interval_ns(interval) -> int:
+    """
+    Interval as int64 ns: accepts a timedelta, pd.Timedelta, a string like
+    "1min" / "1D", or a number of seconds.
+    """
+    if isinstance(interval, (int, float)):
+        ns = int(interval * 1_000_000_000)
+    else:
+        ns = pd.Timedelta(interval).value
+    if ns <= 0:
+        raise ValueError("interval must be > 0")
+    return ns
@@ -0,0 +1,275 @@
+# src/core/vector_backtest.py
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_handler import ColumnarCSVDataHandler
+from src.core.engine import SimpleEngine
+from src.core.event_log import NullEventLog
+from src.core.tick_store import TickStore, TickStoreDataHandler
+from src.execution.execution_sim import ExecutionSimulator
+from src.portfolio.portfolio import Portfolio
+from src.strategies.dummy_strat import DummyStrategy
+
+
+def load_columns(path: str) -> Dict[str, Any]:
+    """
+    Tick columns in replay order from a CSV or a binary tick store:
+    timestamp (int64 ns UTC), symbol_id, symbols, bid, ask, last, tz_utc.
+    """
+    if path.endswith(".ticks"):
+        store = TickStore(path)
+        rec = store.records
+        return {
+            "timestamp": np.asarray(rec["ts"]),
+            "symbol_id": np.asarray(rec["sym"]).astype(np.int64),
+            "symbols": store.symbols,
+            "bid": np.asarray(rec["bid"]),
+            "ask": np.asarray(rec["ask"]),
+            "last": np.asarray(rec["last"]),
+            "tz_utc": store.tz_utc,
+        }
+    dh = ColumnarCSVDataHandler(path)
+    return {
+        "timestamp": dh.timestamps.view("i8"),
+        "symbol_id": np.asarray(dh.symbol_ids, dtype=np.int64),
+        "symbols": dh.registry.symbols,
+        "bid": dh.bid,
+        "ask": dh.ask,
+        "last": dh.last,
+        "tz_utc": dh.tz_utc,
+    }
+
+
+@dataclass
+class VectorBacktestResult:
+    """
+    Output of crossover_backtest(): final state (same meaning as
+    Portfolio.snapshot()), the fills, and NAV after every tick.
+    """
+    cash: float
+    positions: Dict[str, int]
+    realized_pnl: float
+    unrealized_pnl: float
+    total_commission: float
+    nav: float
+    trades: pd.DataFrame
+    nav_curve: pd.Series
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "cash": round(self.cash, 2),
+            "positions": dict(self.positions),
+            "unrealized_pnl": round(self.unrealized_pnl, 2),
+            "realized_pnl": round(self.realized_pnl, 2),
+            "nav": round(self.nav, 2),
+            "total_commission": round(self.total_commission, 2),
+        }
+
+
+def _crossover_state(price: np.ndarray, sma_window: int, ema_period: int) -> np.ndarray:
+    """
+    DummyStrategy's FLAT (0) / LONG (1) state after each tick of one
+    symbol: LONG once EMA > SMA, FLAT once EMA < SMA, unchanged on ties
+    and before the SMA has a full window.
+    """
+    s = pd.Series(price)
+    sma = s.rolling(sma_window).mean().to_numpy()
+    ema = s.ewm(span=ema_period, adjust=False).mean().to_numpy()
+
+    n = len(price)
+    direction = np.full(n, -1, dtype=np.int64)
+    warm = ~np.isnan(sma)
+    direction[warm & (ema > sma)] = 1
+    direction[warm & (ema < sma)] = 0
+
+    # Forward-fill the last decided direction (FLAT before the first one)
+    idx = np.where(direction >= 0, np.arange(n), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, direction[np.maximum(idx, 0)], 0)
+
+
+def crossover_backtest(
+    columns: Dict[str, Any],
+    sma_window: int = 20,
+    ema_period: int = 10,
+    base_quantity: int = 10,
+    initial_capital: float = 1_000_000,
+    max_shares_per_symbol: int = 500,
+    commission_per_share: float = 0.0,
+) -> VectorBacktestResult:
+    """
+    Vectorized equivalent of SimpleEngine + DummyStrategy + Portfolio +
+    ExecutionSimulator on the same ticks (see load_columns()):
+
+    - indicators per symbol over the whole price array (pandas rolling
+      mean / ewm(adjust=False), same recurrences as RollingSMA / EMA)
+    - crossover state machine as a forward fill; the position is
+      min(base_quantity, max_shares_per_symbol) while LONG, 0 while FLAT
+    - BUY fills at ask, SELL at bid (last if the book is missing),
+      commission per share; marks at mid
+    - cash and NAV as cumulative sums in global tick order
+
+    The engine skips a BUY when cash is short; this is checked and raises
+    ValueError if it would have happened (use SimpleEngine then).
+    Results match the engine up to floating-point rounding of the
+    indicators (validate_against_engine()).
+    """
+    if sma_window <= 0 or ema_period <= 0:
+        raise ValueError("sma_window and ema_period must be > 0")
+
+    ts = np.asarray(columns["timestamp"])
+    sym = np.asarray(columns["symbol_id"])
+    bid = np.asarray(columns["bid"], dtype=np.float64)
+    ask = np.asarray(columns["ask"], dtype=np.float64)
+    last = np.asarray(columns["last"], dtype=np.float64)
+    names = columns["symbols"]
+    n = len(sym)
+    qty = min(base_quantity, max_shares_per_symbol)
+
+    book = ~np.isnan(bid) & ~np.isnan(ask)
+    mark = np.where(book & (bid != 0) & (ask != 0), (bid + ask) / 2.0, last)
+
+    # Per-symbol rows (stable, so each group stays in time order)
+    order = np.argsort(sym, kind="stable")
+    bounds = np.flatnonzero(np.r_[True, sym[order][1:] != sym[order][:-1], True])
+
+    mv_delta = np.zeros(n)                     # change in that symbol's market value
+    trade = np.zeros(n, dtype=np.int64)        # +1 buy, -1 sell at this tick
+    final_pos = {}
+    final_mark = {}
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        rows = order[a:b]
+        state = _crossover_state(last[rows], sma_window, ema_period)
+        pos = state * qty
+        change = np.diff(pos, prepend=0)
+        trade[rows] = np.sign(change)
+        mv = pos * mark[rows]
+        mv_delta[rows] = np.diff(mv, prepend=0.0)
+        s = int(sym[rows[0]])
+        final_pos[names[s]] = int(pos[-1])
+        final_mark[names[s]] = float(mark[rows[-1]])
+
+    # Fills and cash in global order
+    fill_rows = np.flatnonzero(trade)
+    side = trade[fill_rows]
+    px = np.where(
+        book[fill_rows],
+        np.where(side > 0, ask[fill_rows], bid[fill_rows]),
+        last[fill_rows],
+    )
+    comm = np.full(len(fill_rows), commission_per_share * qty)
+    cash_delta = -side * qty * px - comm
+    cash_after = initial_capital + np.cumsum(cash_delta)
+    cash_before = np.r_[initial_capital, cash_after[:-1]]
+    if np.any((side > 0) & (qty * mark[fill_rows] > cash_before)):
+        raise ValueError("cash constraint binds: a BUY would be skipped, use SimpleEngine")
+
+    # Realized PnL: each SELL closes the preceding BUY of its symbol
+    fill_sym = sym[fill_rows]
+    realized = 0.0
+    entry_px = {}
+    if len(fill_rows):
+        by_sym = np.argsort(fill_sym, kind="stable")
+        s_px, s_side, s_sym = px[by_sym], side[by_sym], fill_sym[by_sym]
+        sells = np.flatnonzero(s_side < 0)
+        # A symbol's fills alternate BUY / SELL starting with a BUY, so
+        # each SELL's entry is the fill before it
+        realized = float(np.sum(qty * (s_px[sells] - s_px[sells - 1])))
+        # Still-open entries: symbols whose last fill is a BUY
+        is_last = np.r_[s_sym[1:] != s_sym[:-1], True]
+        for i in np.flatnonzero(is_last & (s_side > 0)):
+            entry_px[names[int(s_sym[i])]] = float(s_px[i])
+
+    cash_tick = np.full(n, 0.0)
+    cash_tick[fill_rows] = cash_delta
+    nav_tick = initial_capital + np.cumsum(cash_tick) + np.cumsum(mv_delta)
+
+    cash = float(cash_after[-1]) if len(fill_rows) else float(initial_capital)
+    mkt_value = sum(final_pos[s] * final_mark[s] for s in final_pos)
+    unrealized = sum(final_pos[s] * (final_mark[s] - entry_px[s]) for s in final_pos if final_pos[s])
+
+    stamps = pd.DatetimeIndex(ts.view("datetime64[ns]"))
+    if columns.get("tz_utc"):
+        stamps = stamps.tz_localize("UTC")
+    sym_names = np.asarray(names, dtype=object)
+    trades = pd.DataFrame({
+        "row": fill_rows,
+        "timestamp": stamps[fill_rows],
+        "symbol": sym_names[fill_sym] if len(fill_rows) else np.empty(0, dtype=object),
+        "direction": np.where(side > 0, "BUY", "SELL"),
+        "quantity": np.full(len(fill_rows), qty),
+        "price": px,
+        "commission": comm,
+    })
+
+    return VectorBacktestResult(
+        cash=cash,
+        positions={s: p for s, p in final_pos.items()},
+        realized_pnl=realized,
+        unrealized_pnl=float(unrealized),
+        total_commission=float(comm.sum()),
+        nav=cash + mkt_value,
+        trades=trades,
+        nav_curve=pd.Series(nav_tick, index=stamps, name="nav"),
+    )
+
+
+def validate_against_engine(path: str, rtol: float = 1e-9, **params) -> Dict[str, Any]:
+    """
+    Run crossover_backtest() and the event engine (SimpleEngine with
+    DummyStrategy, quiet log) on the same file and compare fills, final
+    state and NAV at the end of every timestamp. params are
+    crossover_backtest() keyword arguments.
+    """
+    cols = load_columns(path)
+    fast = crossover_backtest(cols, **params)
+
+    p = dict(sma_window=20, ema_period=10, base_quantity=10, initial_capital=1_000_000,
+             max_shares_per_symbol=500, commission_per_share=0.0)
+    p.update(params)
+    portfolio = Portfolio(
+        base_quantity=p["base_quantity"],
+        initial_capital=p["initial_capital"],
+        max_shares_per_symbol=p["max_shares_per_symbol"],
+    )
+    strategy = DummyStrategy(portfolio=portfolio, sma_window=p["sma_window"], ema_period=p["ema_period"])
+    engine = SimpleEngine(
+        strategy, portfolio, ExecutionSimulator(commission_per_share=p["commission_per_share"]),
+        event_log=NullEventLog(),
+    )
+    dh = TickStoreDataHandler(path) if path.endswith(".ticks") else ColumnarCSVDataHandler(path)
+    engine.run_from_datahandler(dh, print_summary=False)
+
+    # Fills: engine position deltas vs vectorized trades
+    deltas = portfolio.history.position_deltas()
+    engine_trades: List[tuple] = list(zip(deltas["symbol"], deltas["position"]))
+    fast_pos = []
+    held = {}
+    for s, d, q in zip(fast.trades["symbol"], fast.trades["direction"], fast.trades["quantity"]):
+        held[s] = held.get(s, 0) + (q if d == "BUY" else -q)
+        fast_pos.append((s, int(held[s])))
+
+    # NAV after the last tick of each timestamp
+    engine_nav = portfolio.equity_curve()
+    engine_nav = engine_nav[~engine_nav.index.duplicated(keep="last")]
+    fast_nav = fast.nav_curve[~fast.nav_curve.index.duplicated(keep="last")]
+    nav_diff = float(np.max(np.abs(engine_nav.to_numpy() - fast_nav.to_numpy()))) if len(fast_nav) else 0.0
+
+    engine_snap = portfolio.snapshot()
+    fast_snap = fast.snapshot()
+    state_ok = all(
+        np.isclose(engine_snap[k], fast_snap[k], rtol=rtol, atol=0.01)
+        for k in ("cash", "realized_pnl", "unrealized_pnl", "nav", "total_commission")
+    )
+    return {
+        "trades_match": engine_trades == fast_pos,
+        "n_trades": len(fast.trades),
+        "state_match": state_ok,
+        "max_nav_diff": nav_diff,
+        "engine": engine_snap,
+        "vectorized": fast_snap,
+    }
@@ -28,7 +28,7 @@ if __name__ == "__main__":
     curve = portfolio.equity_curve()
 
     print("\nLast NAV points:")
-    for t, nav in curve[-3:]:
+    for t, nav in curve.tail(3).items():
         print(f"  {t} {nav:.2f}")
 
     print("\nFinal snapshot:")
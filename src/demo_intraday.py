@@ -1,11 +1,19 @@
 # src/demo_intraday.py
+import os
+
 from src.core.engine import SimpleEngine
-from src.data.data_handler import CSVDataHandler
+from src.core.tick_store import TickStoreDataHandler, convert_csv
 from src.portfolio.portfolio import Portfolio
 from src.execution.execution_sim import ExecutionSimulator
 from src.strategies.dummy_strat import DummyStrategy  # SMA/EMA crossover
 
-MAX_BARS = 2000  # limit intraday backtest length
+CSV_PATH = "data/raw/intraday_1m/intraday_multi_1m.csv"
+TICKS_PATH = "data/raw/intraday_1m/intraday_multi_1m.ticks"
+
+# Replay window (start inclusive, end exclusive) and symbol subset
+START = "2025-11-20 14:30:00+00:00"
+END = "2025-11-24 14:30:00+00:00"
+SYMBOLS = None  # e.g. ["AAPL"]; None replays every symbol
 
 if __name__ == "__main__":
     print("Hello from intraday demo")
@@ -21,16 +29,19 @@ if __name__ == "__main__":
     )
 
     engine = SimpleEngine(strategy, portfolio, execution)
-    MAX_BARS = 2000
 
-    dh = CSVDataHandler("data/raw/intraday_1m/intraday_multi_1m.csv")
+    # One-time CSV -> binary conversion; later runs skip parsing entirely
+    if not os.path.exists(TICKS_PATH) or os.path.getmtime(TICKS_PATH) < os.path.getmtime(CSV_PATH):
+        convert_csv(CSV_PATH, TICKS_PATH)
+
+    dh = TickStoreDataHandler(TICKS_PATH, start=START, end=END, symbols=SYMBOLS)
 
-    engine.run_from_datahandler(dh, max_rows=MAX_BARS)
+    engine.run_from_datahandler(dh)
 
     curve = portfolio.equity_curve()
 
     print("\nLast NAV points:")
-    for t, nav in curve[-3:]:
+    for t, nav in curve.tail(3).items():
         print(f"  {t} {nav:.2f}")
 
     print("\nFinal snapshot:")
@@ -0,0 +1,19 @@
+# src/demo_sweep.py
+
+from src.core.sweep import param_grid, run_sweep
+
+CSV_PATH = "data/raw/intraday_1m/intraday_multi_1m.csv"
+
+if __name__ == "__main__":
+    print("SMA/EMA parameter sweep...")
+
+    grid = param_grid(sma_window=[10, 20, 30, 50], ema_period=[5, 10, 15])
+    results = run_sweep(
+        CSV_PATH,
+        grid,
+        portfolio_kwargs={"base_quantity": 10, "initial_capital": 1_000_000},
+        execution_kwargs={"commission_per_share": 0.01},
+    )
+
+    cols = ["sma_window", "ema_period", "nav", "total_return", "max_drawdown", "fills", "seconds"]
+    print(results.sort_values("nav", ascending=False)[cols].to_string(index=False))
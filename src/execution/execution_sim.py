@@ -1,38 +1,153 @@
 # src/execution/execution_sim.py
 
-from datetime import datetime
-from src.core.events import OrderEvent, FillEvent
+from itertools import count
+from typing import Dict, List, Optional
+
+from src.core.events import MarketEvent, OrderEvent, FillEvent
+from src.execution.fees import FeeModel, PerShareFee
+from src.execution.impact import ImpactModel
+from src.execution.order_book import LimitOrderBook, RestingOrder
 
 
 class ExecutionSimulator:
     """
     Minimal execution simulator:
     - Takes OrderEvent
-    - Fills immediately at a given price
+    - MKT orders fill immediately at a given price
+    - LMT orders fill immediately if marketable, otherwise rest in a
+      per-symbol LimitOrderBook and fill (possibly partially) from later
+      market data, see on_market()
+    - CXL orders cancel a resting order by order_id
     - Returns FillEvent
 
-    Later we will add:
-    - partial fills
-    - slippage
-    - queue position
-    - maker/taker fees
+    queue_ahead: assumed external shares ahead of each new resting order
+    at its price level (0 = front of the queue).
+
+    impact: optional ImpactModel (src/execution/impact.py) applied to
+    taker fills, e.g. SquareRootImpact(0.001). It reads bid / ask / volume
+    from `quotes`, the QuoteBook SimpleEngine attaches.
+
+    fees: optional FeeModel (src/execution/fees.py) for maker/taker,
+    tiered or per-venue commissions; defaults to a flat
+    commission_per_share.
+
+    Malformed orders (a CXL without order_id, a LMT without price) are
+    dropped like unfillable ones and counted in `rejected`, so one bad
+    strategy order does not stop a run.
     """
 
-    def __init__(self, commission_per_share: float = 0.0):
+    def __init__(self, commission_per_share: float = 0.0, queue_ahead: float = 0.0,
+                 impact: ImpactModel = None, fees: FeeModel = None):
         self.commission_per_share = commission_per_share
+        self.fees = fees if fees is not None else PerShareFee(commission_per_share)
+        self.queue_ahead = queue_ahead
+        self.impact = impact
+        self.quotes = None  # set by SimpleEngine
+        self.books: Dict[str, LimitOrderBook] = {}
+        self._order_ids = count(1)
+        self._resting_symbol: Dict[int, str] = {}  # order_id -> symbol
+        self.rejected = 0  # malformed orders dropped
 
-    def on_order(self, order: OrderEvent, fill_price: float):
+    def on_order(self, order: OrderEvent, fill_price: Optional[float], timestamp=None):
         """
-        Convert an OrderEvent into a FillEvent at fill_price.
+        Convert an OrderEvent into a FillEvent at fill_price (the current
+        touch for the order's side). Returns None for limit orders that
+        rest, for cancels and for malformed orders.
+
+        timestamp: simulated execution time for the fill (defaults to the
+        order's timestamp).
         """
-        commission = self.commission_per_share * order.quantity
+        if order.order_type == "CXL":
+            if order.order_id is None:
+                self.rejected += 1
+                return None
+            self.cancel(order.order_id)
+            return None
+
+        if order.order_type == "LMT" and order.price is None:
+            self.rejected += 1
+            return None
+
+        if order.order_id is None:
+            order.order_id = next(self._order_ids)
+
+        if order.order_type == "LMT":
+            marketable = fill_price is not None and (
+                fill_price <= order.price if order.direction == "BUY" else fill_price >= order.price
+            )
+            if not marketable:
+                self._book(order.symbol).add(order)
+                self._resting_symbol[order.order_id] = order.symbol
+                return None
+
+        if fill_price is None:
+            return None
+        if self.impact is not None:
+            fill_price = self._impact_price(order, fill_price)
+        if timestamp is None:
+            timestamp = order.timestamp
+        return self._fill(order, order.quantity, fill_price, timestamp, "TAKER")
+
+    def _impact_price(self, order: OrderEvent, price: float) -> float:
+        bid = ask = volume = None
+        quotes = self.quotes
+        if quotes is not None:
+            sid = quotes.registry.get(order.symbol)
+            if sid is not None and sid < quotes.capacity:
+                bid, ask, volume = float(quotes.bid[sid]), float(quotes.ask[sid]), float(quotes.volume[sid])
+        side = 1 if order.direction == "BUY" else -1
+        return float(self.impact.adjust(order.symbol, side, price, order.quantity, bid, ask, volume))
+
+    def on_market(self, event: MarketEvent) -> List[FillEvent]:
+        """
+        Match the symbol's resting orders against a market update (quote,
+        last trade and its volume). Returns the resulting fills.
+        """
+        book = self.books.get(event.symbol)
+        if book is None or not book.orders:
+            return []
+
+        fills = []
+        for resting, qty in book.match(event.bid, event.ask, event.last, event.volume):
+            fills.append(self._fill(resting.order, qty, resting.price, event.timestamp, "MAKER"))
+            if resting.level is None:
+                self._resting_symbol.pop(resting.order_id, None)
+        return fills
+
+    def cancel(self, order_id: int) -> Optional[RestingOrder]:
+        """
+        Cancel a resting order. Returns it (`filled` tells how much was
+        executed before the cancel) or None if it is not resting.
+        """
+        symbol = self._resting_symbol.pop(order_id, None)
+        if symbol is None:
+            return None
+        return self.books[symbol].cancel(order_id)
+
+    def resting_orders(self, symbol: Optional[str] = None) -> List[RestingOrder]:
+        books = self.books.values() if symbol is None else [self.books.get(symbol)]
+        return [o for book in books if book is not None for o in book.orders.values()]
+
+    def has_resting(self) -> bool:
+        return bool(self._resting_symbol)
+
+    def _book(self, symbol: str) -> LimitOrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = LimitOrderBook(symbol, self.queue_ahead)
+        return book
+
+    def _fill(self, order: OrderEvent, quantity: int, fill_price: float, timestamp, liquidity: str) -> FillEvent:
+        commission = self.fees.fee(order, quantity, fill_price, liquidity, timestamp)
 
         fill = FillEvent(
             symbol=order.symbol,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             direction=order.direction,
-            quantity=order.quantity,
+            quantity=quantity,
             fill_price=fill_price,
-            commission=commission
+            commission=commission,
+            order_id=order.order_id,
+            liquidity=liquidity,
         )
         return fill
@@ -0,0 +1,126 @@
+# src/execution/fees.py
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+MAKER = 0
+TAKER = 1
+
+
+def _liq(liquidity: Optional[str]) -> int:
+    # Fills without a liquidity flag are charged as taker
+    return MAKER if liquidity == "MAKER" else TAKER
+
+
+def _month(timestamp) -> Optional[int]:
+    if timestamp is None or not hasattr(timestamp, "year"):
+        return None
+    return timestamp.year * 12 + timestamp.month
+
+
+class FeeModel:
+    """
+    Commission for one fill. Positive = fee paid, negative = rebate.
+
+    fee() is called once per fill in fill order, so models may keep
+    running state (e.g. monthly volume for tiers).
+    """
+
+    def fee(self, order, quantity: int, price: float, liquidity: Optional[str] = None, timestamp=None) -> float:
+        raise NotImplementedError
+
+
+class PerShareFee(FeeModel):
+    """
+    Flat per-share commission, maker or taker alike (the simulator's
+    historical commission_per_share).
+    """
+
+    def __init__(self, per_share: float = 0.0):
+        self.per_share = per_share
+
+    def fee(self, order, quantity, price, liquidity=None, timestamp=None):
+        return self.per_share * quantity
+
+
+class FeeSchedule(FeeModel):
+    """
+    Maker/taker rates with monthly volume tiers.
+
+    tiers: (min monthly shares, maker rate, taker rate) rows; a negative
+    maker rate is a rebate. unit="share" charges rate * quantity,
+    unit="bps" charges rate bps of notional.
+
+    Rates are precomputed into a (tier, liquidity) table. Monthly volume
+    only grows within a month, so the current tier index just moves up
+    as thresholds are crossed and resets when the month changes: O(1)
+    per fill. The tier of a fill is the one in effect before it.
+    """
+
+    UNITS = ("share", "bps")
+
+    def __init__(self, tiers: Sequence[Tuple[float, float, float]], unit: str = "share"):
+        if not tiers:
+            raise ValueError("FeeSchedule needs at least one tier")
+        if unit not in self.UNITS:
+            raise ValueError(f"Unknown fee unit: {unit}")
+        rows = sorted(tiers, key=lambda t: t[0])
+        if rows[0][0] > 0:
+            raise ValueError("first tier must start at 0 volume")
+
+        self.unit = unit
+        self.thresholds = np.array([t[0] for t in rows], dtype=np.float64)
+        scale = 1e-4 if unit == "bps" else 1.0
+        self.table = np.array([[t[1] * scale, t[2] * scale] for t in rows], dtype=np.float64)
+        # Python copies for the per-fill path (list indexing beats NumPy scalars)
+        self._thresholds = self.thresholds.tolist()
+        self._rates = self.table.tolist()
+
+        self.month = None
+        self.month_volume = 0.0
+        self.tier = 0
+
+    @classmethod
+    def flat(cls, maker: float, taker: float, unit: str = "share") -> "FeeSchedule":
+        return cls([(0, maker, taker)], unit=unit)
+
+    def _roll(self, timestamp):
+        month = _month(timestamp)
+        if month is not None and month != self.month:
+            self.month = month
+            self.month_volume = 0.0
+            self.tier = 0
+
+    def fee(self, order, quantity, price, liquidity=None, timestamp=None):
+        self._roll(timestamp)
+        rate = self._rates[self.tier][_liq(liquidity)]
+        fee = rate * quantity if self.unit == "share" else rate * quantity * price
+
+        self.month_volume += quantity
+        thresholds = self._thresholds
+        while self.tier + 1 < len(thresholds) and self.month_volume >= thresholds[self.tier + 1]:
+            self.tier += 1
+        return fee
+
+
+class VenueFees(FeeModel):
+    """
+    One FeeSchedule per venue, chosen by OrderEvent.venue (orders without
+    a venue, or with an unknown one, use `default`). Each venue tracks
+    its own monthly volume tier.
+    """
+
+    def __init__(self, schedules: Dict[str, FeeModel], default: str):
+        if default not in schedules:
+            raise ValueError(f"default venue {default!r} has no schedule")
+        self.schedules = schedules
+        self.default = default
+
+    def fee(self, order, quantity, price, liquidity=None, timestamp=None):
+        venue = getattr(order, "venue", None)
+        schedule = self.schedules.get(venue) if venue is not None else None
+        if schedule is None:
+            schedule = self.schedules[self.default]
+        return schedule.fee(order, quantity, price, liquidity, timestamp)
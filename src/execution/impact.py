@@ -0,0 +1,251 @@
+# src/execution/impact.py
+
+import math
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_handler import frame_columns
+from src.core.tick_store import TickStore
+
+
+class ImpactModel:
+    """
+    Fill-price adjustment for taker fills.
+
+    adjust() gets the touch price the engine would fill at (ask for BUY,
+    bid for SELL), the order size and the symbol's latest bid / ask /
+    volume (NaN or None when unknown) and returns the price actually paid.
+    side is +1 for BUY, -1 for SELL; a positive cost always moves the
+    price against us. The base class is "no impact".
+    """
+
+    def adjust(self, symbol: str, side: int, price: float, quantity: int, bid=None, ask=None, volume=None) -> float:
+        return price
+
+    def reset(self):
+        pass
+
+
+def _known(x) -> bool:
+    return x is not None and x == x
+
+
+def _participation(quantity: int, volume) -> float:
+    """
+    Order size / market volume of the current tick or bar; 0 if unknown.
+    """
+    if not _known(volume) or volume <= 0:
+        return 0.0
+    return quantity / volume
+
+
+class FixedBpsSlippage(ImpactModel):
+    """
+    Constant cost of `bps` basis points on top of the touch.
+    """
+
+    def __init__(self, bps: float):
+        self.bps = bps
+
+    def adjust(self, symbol, side, price, quantity, bid=None, ask=None, volume=None):
+        return price * (1.0 + side * self.bps * 1e-4)
+
+
+class SpreadSlippage(ImpactModel):
+    """
+    Cost of `fraction` of the quoted spread beyond the touch (no-op when
+    the spread is unknown).
+    """
+
+    def __init__(self, fraction: float = 0.5):
+        self.fraction = fraction
+
+    def adjust(self, symbol, side, price, quantity, bid=None, ask=None, volume=None):
+        if not (_known(bid) and _known(ask)) or ask <= bid:
+            return price
+        return price + side * self.fraction * (ask - bid)
+
+
+class SquareRootImpact(ImpactModel):
+    """
+    Square-root law: cost = coef * sqrt(quantity / volume) * price, with
+    coef the relative impact at 100% participation.
+    """
+
+    def __init__(self, coef: float):
+        self.coef = coef
+
+    def adjust(self, symbol, side, price, quantity, bid=None, ask=None, volume=None):
+        part = _participation(quantity, volume)
+        return price * (1.0 + side * self.coef * math.sqrt(part))
+
+
+class LinearImpact(ImpactModel):
+    """
+    Linear temporary + permanent impact in participation:
+    - temporary: this fill pays temporary * (quantity / volume) * price
+    - permanent: our own later fills in the symbol are shifted by the
+      accumulated permanent * (quantity / volume) (relative), since the
+      replayed market data never reflects our trades
+
+    reset() clears the permanent shift (e.g. at the start of a day).
+    """
+
+    def __init__(self, temporary: float, permanent: float = 0.0):
+        self.temporary = temporary
+        self.permanent = permanent
+        self._shift: Dict[str, float] = {}
+
+    def adjust(self, symbol, side, price, quantity, bid=None, ask=None, volume=None):
+        part = _participation(quantity, volume)
+        shift = self._shift.get(symbol, 0.0)
+        px = price * (1.0 + shift + side * self.temporary * part)
+        if self.permanent and part:
+            self._shift[symbol] = shift + side * self.permanent * part
+        return px
+
+    def reset(self):
+        self._shift.clear()
+
+
+# -----------------------
+# Calibration
+# -----------------------
+@dataclass
+class ImpactCalibration:
+    """
+    Model parameters fitted from market data by calibrate_impact().
+    """
+    bps: float               # median extra cost beyond the touch, bps
+    spread_fraction: float   # median extra cost beyond the touch, in spreads
+    sqrt_coef: float         # signed return = sqrt_coef * sqrt(participation)
+    temporary: float         # instantaneous minus permanent linear impact
+    permanent: float         # signed return over `horizon` ticks per participation
+    n_obs: int
+
+    def model(self, kind: str) -> ImpactModel:
+        if kind == "bps":
+            return FixedBpsSlippage(self.bps)
+        if kind == "spread":
+            return SpreadSlippage(self.spread_fraction)
+        if kind == "sqrt":
+            return SquareRootImpact(self.sqrt_coef)
+        if kind == "linear":
+            return LinearImpact(self.temporary, self.permanent)
+        raise ValueError(f"Unknown impact model: {kind}")
+
+
+def calibrate_arrays(
+    symbol_id: np.ndarray,
+    bid: np.ndarray,
+    ask: np.ndarray,
+    last: np.ndarray,
+    volume: np.ndarray,
+    horizon: int = 1,
+) -> ImpactCalibration:
+    """
+    Fit all impact models from time-ordered tick arrays (any symbol mix;
+    volume < 0 or NaN means missing). Fully vectorized:
+
+    - ticks are grouped by symbol with a stable argsort, and differences
+      that would cross a symbol boundary are masked out
+    - participation is proxied by x = volume[t] / volume[t-1]: a ratio of
+      consecutive tick volumes, not the print's share of traded volume.
+      It is the ratio the models are fed at replay (order quantity / the
+      latest tick's volume in the quote book), so the coefficients apply
+      to what they consume; very uneven tick volumes make it noisy
+    - trade sign from the quote rule: last vs. the previous mid
+    - bps / spread_fraction: median of |last - mid| beyond the half spread
+    - sqrt_coef: least squares of the signed mid return on sqrt(x)
+    - linear: least squares of the signed mid return on sign * x, now
+      (total) and `horizon` ticks ahead (permanent)
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be >= 1")
+
+    order = np.argsort(symbol_id, kind="stable")
+    sid = np.asarray(symbol_id)[order]
+    bid = np.asarray(bid, dtype=np.float64)[order]
+    ask = np.asarray(ask, dtype=np.float64)[order]
+    last = np.asarray(last, dtype=np.float64)[order]
+    vol = np.asarray(volume, dtype=np.float64)[order]
+    vol = np.where(vol >= 0, vol, np.nan)
+
+    mid = (bid + ask) / 2.0
+    spread = ask - bid
+    has_book = (bid > 0) & (ask > bid)
+    mid = np.where(has_book, mid, last)
+
+    # Extra cost beyond the touch implied by trade prints
+    beyond = np.abs(last - mid) - spread / 2.0
+    ok = has_book & np.isfinite(beyond)
+    bps = float(np.median(np.maximum(beyond[ok], 0.0) / mid[ok]) * 1e4) if ok.any() else 0.0
+    frac = float(np.median(np.maximum(beyond[ok], 0.0) / spread[ok])) if ok.any() else 0.0
+
+    # Per-tick mid returns, quote-rule trade signs and participation
+    # against the prevailing tick's volume, within each symbol
+    same = np.r_[False, sid[1:] == sid[:-1]]
+    ret = np.full(len(sid), np.nan)
+    ret[1:] = np.log(mid[1:] / mid[:-1])
+    ret[~same] = np.nan
+    sign = np.zeros(len(sid))
+    sign[1:] = np.sign(last[1:] - mid[:-1])
+    sign[~same | np.isnan(sign)] = 0.0
+    x = np.full(len(sid), np.nan)
+    prev_vol = vol[:-1]
+    x[1:] = vol[1:] / np.where(prev_vol > 0, prev_vol, np.nan)
+    x[~same] = np.nan
+
+    # Return over the next `horizon` ticks, if still in the same symbol
+    fwd = np.full(len(sid), np.nan)
+    if len(sid) > horizon:
+        lag = horizon
+        same_h = sid[lag:] == sid[:-lag]
+        fwd[:-lag] = np.where(same_h, np.log(mid[lag:] / mid[:-lag]), np.nan)
+    ret_h = np.where(np.isnan(ret) | np.isnan(fwd), np.nan, ret + fwd)
+
+    valid = np.isfinite(ret) & np.isfinite(x) & (x > 0) & (sign != 0)
+    sx = np.sqrt(x[valid])
+    sqrt_coef = float(np.dot((sign * ret)[valid], sx) / np.dot(sx, sx)) if valid.any() else 0.0
+    sqrt_coef = max(sqrt_coef, 0.0)
+
+    sx_lin = (sign * x)[valid]
+    denom = float(np.dot(sx_lin, sx_lin))
+    total = float(np.dot(ret[valid], sx_lin) / denom) if denom else 0.0
+
+    valid_h = valid & np.isfinite(ret_h)
+    sx_h = (sign * x)[valid_h]
+    denom_h = float(np.dot(sx_h, sx_h))
+    permanent = float(np.dot(ret_h[valid_h], sx_h) / denom_h) if denom_h else 0.0
+    permanent = max(permanent, 0.0)
+    temporary = max(total - permanent, 0.0)
+
+    return ImpactCalibration(
+        bps=bps,
+        spread_fraction=frac,
+        sqrt_coef=sqrt_coef,
+        temporary=temporary,
+        permanent=permanent,
+        n_obs=int(valid.sum()),
+    )
+
+
+def calibrate_impact(path: str, horizon: int = 1) -> ImpactCalibration:
+    """
+    calibrate_arrays() over a tick CSV (timestamp, symbol, bid, ask, last,
+    volume) or a binary tick store (".ticks"), read as plain column arrays
+    in replay order (no per-row datetime objects).
+    """
+    if path.endswith(".ticks"):
+        rec = TickStore(path).records
+        return calibrate_arrays(rec["sym"], rec["bid"], rec["ask"], rec["last"], rec["volume"], horizon=horizon)
+
+    cols = frame_columns(pd.read_csv(path), objects=False)
+    order = np.argsort(cols["timestamp"], kind="stable")
+    sid = pd.factorize(cols["symbol"][order])[0]
+    return calibrate_arrays(
+        sid, cols["bid"][order], cols["ask"][order], cols["last"][order], cols["volume"][order], horizon=horizon
+    )
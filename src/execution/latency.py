@@ -0,0 +1,103 @@
+# src/execution/latency.py
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def delay_ns(delay) -> int:
+    """
+    Delay as int64 ns: accepts a timedelta, pd.Timedelta, a string like
+    "250us" / "2ms", or a number of seconds. Must be >= 0.
+    """
+    if isinstance(delay, (int, float)):
+        ns = int(delay * 1_000_000_000)
+    else:
+        ns = pd.Timedelta(delay).value
+    if ns < 0:
+        raise ValueError("delay must be >= 0")
+    return ns
+
+
+class LatencyModel:
+    """
+    Delays applied by SimpleEngine(latency=...), in ns of market time:
+    - order_delay(): strategy -> exchange; the order is matched against
+      the quote in effect when it arrives
+    - ack_delay(): exchange -> strategy; the fill reaches the portfolio
+      this much later
+    """
+
+    def order_delay(self) -> int:
+        return 0
+
+    def ack_delay(self) -> int:
+        return 0
+
+
+class ConstantLatency(LatencyModel):
+    """
+    Fixed delays, e.g. ConstantLatency(order="300us", ack="300us").
+    """
+
+    def __init__(self, order=0, ack=0):
+        self.order = delay_ns(order)
+        self.ack = delay_ns(ack)
+
+    def order_delay(self) -> int:
+        return self.order
+
+    def ack_delay(self) -> int:
+        return self.ack
+
+
+class RandomLatency(LatencyModel):
+    """
+    Fixed base delays plus a random part per message:
+      "exponential"  mean `jitter`
+      "uniform"      in [0, jitter)
+      "lognormal"    median `jitter`, log-space std `sigma` (fat tail)
+
+    Draws are generated in NumPy blocks of `block` values, so a draw is
+    an array read, not an RNG call.
+    """
+
+    DISTS = ("exponential", "uniform", "lognormal")
+
+    def __init__(self, order=0, ack=0, jitter="100us", dist: str = "exponential",
+                 sigma: float = 0.5, seed: Optional[int] = None, block: int = 4096):
+        if dist not in self.DISTS:
+            raise ValueError(f"Unknown latency distribution: {dist}")
+        if block <= 0:
+            raise ValueError("block must be > 0")
+        self.order = delay_ns(order)
+        self.ack = delay_ns(ack)
+        self.jitter = delay_ns(jitter)
+        self.dist = dist
+        self.sigma = sigma
+        self.block = block
+        self._rng = np.random.default_rng(seed)
+        self._draws = np.empty(0, dtype=np.int64)
+        self._i = 0
+
+    def _draw(self) -> int:
+        if self._i == len(self._draws):
+            rng, n, j = self._rng, self.block, self.jitter
+            if self.dist == "exponential":
+                x = rng.exponential(j, n)
+            elif self.dist == "uniform":
+                x = rng.uniform(0, j, n)
+            else:
+                x = j * rng.lognormal(0.0, self.sigma, n)
+            self._draws = x.astype(np.int64)
+            self._i = 0
+        d = self._draws[self._i]
+        self._i += 1
+        return int(d)
+
+    def order_delay(self) -> int:
+        return self.order + self._draw()
+
+    def ack_delay(self) -> int:
+        return self.ack + self._draw()
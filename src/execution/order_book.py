@@ -0,0 +1,219 @@
+# src/execution/order_book.py
+
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class RestingOrder:
+    """
+    One of our limit orders resting in a LimitOrderBook.
+
+    Queue position is tracked in units of volume traded at the level:
+    the order fills once the level's cumulative traded volume passes
+    `start` (the volume ahead of us when we joined), up to `end`.
+    """
+
+    __slots__ = ("order", "order_id", "side", "price", "quantity", "filled", "start", "end", "level")
+
+    def __init__(self, order, side: int, start: float, level):
+        self.order = order
+        self.order_id = order.order_id
+        self.side = side                # +1 buy, -1 sell
+        self.price = order.price
+        self.quantity = order.quantity
+        self.filled = 0
+        self.start = start
+        self.end = start + order.quantity
+        self.level = level
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.filled
+
+    @property
+    def queue_ahead(self) -> float:
+        """
+        Estimated volume still ahead of this order at its price level.
+        """
+        return max(0.0, self.start - self.level.traded)
+
+
+class PriceLevel:
+    """
+    FIFO queue of our resting orders at one price, plus the level's
+    cumulative traded volume (`traded`) and queue tail (`tail`).
+    """
+
+    __slots__ = ("side", "price", "orders", "traded", "tail", "live")
+
+    def __init__(self, side: int, price: float):
+        self.side = side
+        self.price = price
+        self.orders = deque()
+        self.traded = 0.0
+        self.tail = 0.0
+        self.live = 0       # orders not yet filled or cancelled
+
+
+class LimitOrderBook:
+    """
+    Our resting limit orders for one symbol, matched against market data.
+
+    Price levels live in a dict (price -> PriceLevel) with a heap of
+    prices per side for the best level (each price pushed at most once),
+    so:
+    - add: O(1) into an existing level, O(log n) for a new one
+    - cancel: O(orders queued behind it at the level) (cancelled orders
+      and empty levels are dropped lazily)
+    - match: O(log n) per level consumed, plus O(1) per order filled
+
+    Fill model (no depth data, only top of book, last and volume):
+    - a new order joins the back of its level behind `queue_ahead`
+      shares of assumed external interest
+    - volume traded at the order's price fills the queue front to back
+      (partial fills as it passes our orders)
+    - a trade through the price, or the opposite quote crossing it, fills
+      the whole level at the limit price
+    - cancelling an own order moves the orders queued behind it forward
+      by its unfilled quantity
+    """
+
+    def __init__(self, symbol: str, queue_ahead: float = 0.0):
+        self.symbol = symbol
+        self.queue_ahead = queue_ahead
+        self.levels: Tuple[Dict[float, PriceLevel], Dict[float, PriceLevel]] = ({}, {})
+        self._heaps: Tuple[List[float], List[float]] = ([], [])  # bids as -price, asks as price
+        self._in_heap: Tuple[set, set] = (set(), set())  # prices with a heap entry
+        self.orders: Dict[int, RestingOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    @staticmethod
+    def _idx(side: int) -> int:
+        return 0 if side > 0 else 1
+
+    def add(self, order) -> RestingOrder:
+        side = 1 if order.direction == "BUY" else -1
+        i = self._idx(side)
+        levels = self.levels[i]
+        level = levels.get(order.price)
+        if level is None:
+            level = levels[order.price] = PriceLevel(side, order.price)
+            if order.price not in self._in_heap[i]:
+                # A dropped level's entry may still be in the heap
+                self._in_heap[i].add(order.price)
+                heapq.heappush(self._heaps[i], -order.price if side > 0 else order.price)
+
+        start = max(level.tail, level.traded + self.queue_ahead)
+        resting = RestingOrder(order, side, start, level)
+        level.tail = resting.end
+        level.orders.append(resting)
+        level.live += 1
+        self.orders[resting.order_id] = resting
+        return resting
+
+    def cancel(self, order_id: int) -> Optional[RestingOrder]:
+        """
+        Remove a resting order; returns it (with what was filled so far)
+        or None if it is not resting here.
+        """
+        resting = self.orders.pop(order_id, None)
+        if resting is None:
+            return None
+        level = resting.level
+        level.live -= 1
+        resting.level = None
+        if level.live == 0:
+            self._drop_level(level)
+            return resting
+
+        # Orders behind it move up by its unfilled part of the queue
+        gap = resting.end - max(resting.start, level.traded)
+        if gap > 0:
+            behind = False
+            for other in level.orders:
+                if behind:
+                    other.start -= gap
+                    other.end -= gap
+                elif other is resting:
+                    behind = True
+            level.tail -= gap
+        return resting
+
+    def _best(self, side: int) -> Optional[PriceLevel]:
+        i = self._idx(side)
+        heap, levels = self._heaps[i], self.levels[i]
+        while heap:
+            price = -heap[0] if side > 0 else heap[0]
+            level = levels.get(price)
+            if level is not None:
+                return level
+            heapq.heappop(heap)
+            self._in_heap[i].discard(price)
+        return None
+
+    def best_price(self, side: int) -> Optional[float]:
+        level = self._best(side)
+        return level.price if level is not None else None
+
+    def match(self, bid, ask, last, volume) -> List[Tuple[RestingOrder, int]]:
+        """
+        Apply one market update; returns (order, filled quantity) pairs in
+        fill order.
+        """
+        fills = []
+        for side in (1, -1):
+            # Opposite quote: asks can cross our bids and vice versa
+            touch = ask if side > 0 else bid
+            if touch is not None and (touch != touch or touch == 0):
+                touch = None
+
+            while True:
+                level = self._best(side)
+                if level is None:
+                    break
+                px = level.price
+                crossed = touch is not None and (touch <= px if side > 0 else touch >= px)
+                through = last is not None and (last < px if side > 0 else last > px)
+
+                if crossed or through:
+                    self._fill_level(level, float("inf"), fills)
+                elif last == px and volume:
+                    level.traded += volume
+                    self._fill_level(level, level.traded, fills)
+                    break
+                else:
+                    break
+        return fills
+
+    def _fill_level(self, level: PriceLevel, traded: float, fills: list):
+        orders = level.orders
+        while orders:
+            resting = orders[0]
+            if resting.level is None:
+                # Cancelled earlier
+                orders.popleft()
+                continue
+            if traded <= resting.start:
+                break
+            qty = int(min(traded, resting.end) - resting.start) - resting.filled
+            if qty > 0:
+                resting.filled += qty
+                fills.append((resting, qty))
+            if resting.filled < resting.quantity:
+                break
+            orders.popleft()
+            self.orders.pop(resting.order_id, None)
+            resting.level = None
+            level.live -= 1
+
+        if level.live == 0:
+            self._drop_level(level)
+
+    def _drop_level(self, level: PriceLevel):
+        # The heap entry is dropped lazily in _best()
+        levels = self.levels[self._idx(level.side)]
+        if levels.get(level.price) is level:
+            del levels[level.price]
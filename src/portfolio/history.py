@@ -0,0 +1,343 @@
+# src/portfolio/history.py
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.symbols import SymbolRegistry
+from src.core.timeutil import NAT, interval_ns, to_ns
+
+
+class _Columns:
+    """
+    Growable set of equal-length NumPy columns (capacity doubles when full).
+    """
+
+    def __init__(self, dtypes: Dict[str, str], capacity: int):
+        self.n = 0
+        self.capacity = capacity
+        self.cols = {name: np.empty(capacity, dtype=dt) for name, dt in dtypes.items()}
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, col in self.cols.items():
+            new = np.empty(self.capacity, dtype=col.dtype)
+            new[:self.n] = col[:self.n]
+            self.cols[name] = new
+
+    def next_row(self) -> int:
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        self.n += 1
+        return i
+
+    def view(self, name: str) -> np.ndarray:
+        return self.cols[name][:self.n]
+
+
+class NavOHLC:
+    """
+    Streaming OHLC aggregation of NAV into fixed market-time buckets
+    (aligned to the epoch, so "1D" buckets are UTC days). O(1) per update;
+    storage grows with the number of buckets, not ticks.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval_ns(interval)
+        self._bars = _Columns({"start": "i8", "open": "f8", "high": "f8", "low": "f8", "close": "f8"}, 256)
+        self._bucket = None
+        self._o = self._h = self._l = self._c = 0.0
+
+    def update(self, ts_ns: int, nav: float):
+        if ts_ns == NAT:
+            return
+        bucket = ts_ns // self.interval
+        if bucket != self._bucket:
+            if self._bucket is not None:
+                self._close_bar()
+            self._bucket = bucket
+            self._o = self._h = self._l = self._c = nav
+            return
+        if nav > self._h:
+            self._h = nav
+        elif nav < self._l:
+            self._l = nav
+        self._c = nav
+
+    def _close_bar(self):
+        i = self._bars.next_row()
+        c = self._bars.cols
+        c["start"][i] = self._bucket * self.interval
+        c["open"][i] = self._o
+        c["high"][i] = self._h
+        c["low"][i] = self._l
+        c["close"][i] = self._c
+
+    def frame(self, tz_utc: bool = False) -> pd.DataFrame:
+        """
+        One row per bucket (including the current, still open one), indexed
+        by bucket start.
+        """
+        b = self._bars
+        cols = {name: b.view(name) for name in ("start", "open", "high", "low", "close")}
+        if self._bucket is not None:
+            cols = {
+                name: np.append(col, val)
+                for (name, col), val in zip(
+                    cols.items(),
+                    (self._bucket * self.interval, self._o, self._h, self._l, self._c),
+                )
+            }
+        idx = pd.DatetimeIndex(cols.pop("start").view("datetime64[ns]"))
+        if tz_utc:
+            idx = idx.tz_localize("UTC")
+        return pd.DataFrame(cols, index=idx)
+
+
+class PortfolioHistory:
+    """
+    Columnar portfolio history.
+
+    One row per recorded mark-to-market in preallocated, growable NumPy
+    columns:
+      timestamp (int64 ns), symbol (ID), price, cash, nav, realized_pnl,
+      unrealized_pnl, total_commission
+
+    Positions are not copied per row: each fill appends a delta
+    (row, symbol, position, avg_cost) and positions_at(i) replays them.
+
+    Recording policy (`record`), so storage follows report resolution
+    rather than tick count:
+      "all"     every mark (default)
+      "every"   last mark of each group of `every` marks
+      "market"  last mark in each `interval` of market time
+      "wall"    last mark in each `interval` of wall-clock time
+      "fills"   only the first mark after a fill
+
+    For "every" / "market" / "wall" the current group's row stays open and
+    is overwritten by each later mark until the group rolls over, so the
+    last row is always the latest mark (final NAV). A fill closes the
+    open row: marks after it start a new row, keeping positions_at()
+    consistent with each row's cash and NAV.
+
+    ohlc_interval additionally aggregates NAV of every mark (recorded or
+    not) into streaming OHLC bars, see nav_ohlc().
+
+    Column accessors return views of the buffers (no copies); they are
+    invalidated by the next append that grows the buffers.
+    """
+
+    COLUMNS = {
+        "timestamp": "i8",
+        "symbol": "i4",
+        "price": "f8",
+        "cash": "f8",
+        "nav": "f8",
+        "realized_pnl": "f8",
+        "unrealized_pnl": "f8",
+        "total_commission": "f8",
+    }
+    DELTAS = {
+        "row": "i8",
+        "timestamp": "i8",
+        "symbol": "i4",
+        "position": "i8",
+        "avg_cost": "f8",
+    }
+
+    RECORD_MODES = ("all", "every", "market", "wall", "fills")
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        registry: Optional[SymbolRegistry] = None,
+        record: str = "all",
+        every: int = 1,
+        interval=None,
+        ohlc_interval=None,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if record not in self.RECORD_MODES:
+            raise ValueError(f"Unknown record mode: {record}")
+        if record == "every" and every <= 0:
+            raise ValueError("every must be > 0")
+        if record in ("market", "wall") and interval is None:
+            raise ValueError(f"record={record!r} needs an interval")
+
+        self.registry = registry if registry is not None else SymbolRegistry()
+        self._rows = _Columns(self.COLUMNS, capacity)
+        self._deltas = _Columns(self.DELTAS, 256)
+        self.tz_utc = False
+
+        self.record = record
+        self.every = every
+        self._interval = interval_ns(interval) if interval is not None else None
+        self._marks = 0
+        self._next_due = NAT
+        self._open = False  # last row is overwritten by marks of its group
+        self._fill_pending = False
+        self.nav_bars = NavOHLC(ohlc_interval) if ohlc_interval is not None else None
+
+    def __len__(self) -> int:
+        return self._rows.n
+
+    def _ns(self, timestamp) -> int:
+        if not self.tz_utc and getattr(timestamp, "tzinfo", None) is not None:
+            self.tz_utc = True
+        return to_ns(timestamp)
+
+    def _slot(self, timestamp, ts_ns) -> int:
+        """
+        Row for this mark: -1 to skip it, else the row index to write (the
+        open row is reused until its group rolls over).
+        """
+        mode = self.record
+        if mode == "all":
+            return self._rows.next_row()
+        if mode == "fills":
+            due = self._fill_pending
+            self._fill_pending = False
+            return self._rows.next_row() if due else -1
+
+        if mode == "every":
+            self._marks += 1
+            new_group = (self._marks - 1) % self.every == 0
+        else:
+            if mode == "market":
+                now = ts_ns if ts_ns is not None else self._ns(timestamp)
+                if now == NAT:
+                    return -1
+            else:
+                now = time.monotonic_ns()
+            new_group = now >= self._next_due
+            if new_group:
+                self._next_due = (now // self._interval + 1) * self._interval
+
+        if new_group or not self._open:
+            self._open = True
+            return self._rows.next_row()
+        return self._rows.n - 1
+
+    def append(self, timestamp, symbol, price, cash, nav, realized_pnl, unrealized_pnl, total_commission):
+        """
+        Offer one mark-to-market; stored according to the recording policy
+        (NAV OHLC bars see every mark).
+        """
+        ts_ns = None
+        if self.nav_bars is not None:
+            ts_ns = self._ns(timestamp)
+            self.nav_bars.update(ts_ns, nav)
+
+        i = self._slot(timestamp, ts_ns)
+        if i < 0:
+            return
+
+        c = self._rows.cols
+        c["timestamp"][i] = ts_ns if ts_ns is not None else self._ns(timestamp)
+        c["symbol"][i] = self.registry.intern(symbol)
+        c["price"][i] = price
+        c["cash"][i] = cash
+        c["nav"][i] = nav
+        c["realized_pnl"][i] = realized_pnl
+        c["unrealized_pnl"][i] = unrealized_pnl
+        c["total_commission"][i] = total_commission
+
+    def record_position(self, timestamp, symbol, position, avg_cost):
+        """
+        Position change from a fill; applies from the next history row on.
+        """
+        self._fill_pending = True
+        self._open = False
+        i = self._deltas.next_row()
+        c = self._deltas.cols
+        c["row"][i] = self._rows.n
+        c["timestamp"][i] = self._ns(timestamp)
+        c["symbol"][i] = self.registry.intern(symbol)
+        c["position"][i] = position
+        c["avg_cost"][i] = avg_cost
+
+    # -----------------------
+    # Accessors
+    # -----------------------
+    def column(self, name: str) -> np.ndarray:
+        return self._rows.view(name)
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        ts = self._rows.view("timestamp").view("datetime64[ns]")
+        idx = pd.DatetimeIndex(ts, copy=False)
+        return idx.tz_localize("UTC") if self.tz_utc else idx
+
+    def equity_curve(self) -> pd.Series:
+        """
+        NAV per row, indexed by timestamp (values are a view of the buffer).
+        """
+        return pd.Series(self._rows.view("nav"), index=self.timestamps(), name="nav", copy=False)
+
+    def nav_ohlc(self) -> pd.DataFrame:
+        """
+        NAV open/high/low/close per ohlc_interval bucket.
+        """
+        if self.nav_bars is None:
+            raise ValueError("PortfolioHistory was created without ohlc_interval")
+        return self.nav_bars.frame(self.tz_utc)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        All columns as a DataFrame indexed by timestamp; symbol IDs are
+        mapped back to tickers.
+        """
+        data = {
+            name: self._rows.view(name)
+            for name in self.COLUMNS
+            if name not in ("timestamp", "symbol")
+        }
+        names = np.asarray(self.registry.symbols, dtype=object)
+        data["symbol"] = names[self._rows.view("symbol")] if len(names) else np.empty(0, dtype=object)
+        return pd.DataFrame(data, index=self.timestamps(), copy=False)
+
+    def position_deltas(self) -> pd.DataFrame:
+        names = np.asarray(self.registry.symbols, dtype=object)
+        sym = self._deltas.view("symbol")
+        ts = pd.DatetimeIndex(self._deltas.view("timestamp").view("datetime64[ns]"))
+        return pd.DataFrame({
+            "timestamp": ts.tz_localize("UTC") if self.tz_utc else ts,
+            "row": self._deltas.view("row"),
+            "symbol": names[sym] if len(names) else np.empty(0, dtype=object),
+            "position": self._deltas.view("position"),
+            "avg_cost": self._deltas.view("avg_cost"),
+        })
+
+    def positions_at(self, i: int) -> Dict[str, int]:
+        """
+        Positions as of history row i (negative i counts from the end).
+        """
+        if i < 0:
+            i += len(self)
+        rows = self._deltas.view("row")
+        k = int(np.searchsorted(rows, i, side="right"))
+        pos = {}
+        for sid, qty in zip(self._deltas.view("symbol")[:k].tolist(),
+                            self._deltas.view("position")[:k].tolist()):
+            pos[self.registry.symbols[sid]] = qty
+        return pos
+
+    def row(self, i: int) -> Dict:
+        """
+        One history row as a dict (the old per-tick snapshot layout, minus
+        avg_cost).
+        """
+        if i < 0:
+            i += len(self)
+        ts = self.timestamps()[i]
+        rec = {"timestamp": ts}
+        for name in self.COLUMNS:
+            if name == "timestamp":
+                continue
+            val = self._rows.view(name)[i].item()
+            rec[name] = self.registry.symbols[val] if name == "symbol" else val
+        rec["positions"] = self.positions_at(i)
+        return rec
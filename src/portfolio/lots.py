@@ -0,0 +1,96 @@
+# src/portfolio/lots.py
+
+from array import array
+from typing import List, Tuple
+
+
+COST_BASIS = ("avg", "fifo", "lifo")
+
+
+class LotQueue:
+    """
+    Open lots of one symbol as a ring-buffer deque over two flat arrays
+    (int64 quantity, float64 price): 16 bytes per lot, no per-lot objects.
+
+    All lots of a symbol are on the same side as its position, so
+    quantities are stored unsigned. Running totals of quantity and cost
+    make avg_cost() O(1); close() consumes lots from the front (FIFO) or
+    the back (LIFO).
+    """
+
+    __slots__ = ("_qty", "_px", "_head", "_n", "quantity", "cost")
+
+    def __init__(self, capacity: int = 8):
+        self._qty = array("q", bytes(8 * capacity))
+        self._px = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._n = 0
+        self.quantity = 0     # total open quantity
+        self.cost = 0.0       # sum of quantity * price over open lots
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self):
+        # Unroll the ring so the lots start at 0, then double
+        cap = len(self._qty)
+        h = self._head
+        self._qty = self._qty[h:] + self._qty[:h] + array("q", bytes(8 * cap))
+        self._px = self._px[h:] + self._px[:h] + array("d", bytes(8 * cap))
+        self._head = 0
+
+    def push(self, quantity: int, price: float):
+        if self._n == len(self._qty):
+            self._grow()
+        i = (self._head + self._n) % len(self._qty)
+        self._qty[i] = quantity
+        self._px[i] = price
+        self._n += 1
+        self.quantity += quantity
+        self.cost += quantity * price
+
+    def close(self, quantity: int, lifo: bool = False) -> float:
+        """
+        Remove `quantity` from the open lots (oldest first, or newest first
+        if lifo) and return the cost basis of what was closed.
+        """
+        if quantity > self.quantity:
+            raise ValueError("cannot close more than the open quantity")
+
+        qtys, pxs = self._qty, self._px
+        cap = len(qtys)
+        basis = 0.0
+        left = quantity
+        while left > 0:
+            i = (self._head + self._n - 1) % cap if lifo else self._head
+            lot = qtys[i]
+            take = lot if lot <= left else left
+            basis += take * pxs[i]
+            left -= take
+            if take == lot:
+                self._n -= 1
+                if not lifo:
+                    self._head = (self._head + 1) % cap
+            else:
+                qtys[i] = lot - take
+
+        self.quantity -= quantity
+        if self._n == 0:
+            self._head = 0
+            self.cost = 0.0  # drop accumulated rounding
+        else:
+            self.cost -= basis
+        return basis
+
+    def avg_cost(self) -> float:
+        return self.cost / self.quantity if self.quantity else 0.0
+
+    def lots(self) -> List[Tuple[int, float]]:
+        """
+        (quantity, price) per open lot, oldest first.
+        """
+        cap = len(self._qty)
+        return [
+            (self._qty[(self._head + k) % cap], self._px[(self._head + k) % cap])
+            for k in range(self._n)
+        ]
@@ -1,7 +1,16 @@
 # src/portfolio/portfolio.py
 
 from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
 from src.core.events import SignalEvent, OrderEvent, FillEvent
+from src.core.symbols import SymbolRegistry
+from src.portfolio.history import PortfolioHistory
+from src.portfolio.lots import COST_BASIS, LotQueue
+from src.portfolio.position_book import BookView, PositionBook, PriceView
+from src.portfolio.risk import OK, PreTradeRisk, RiskLimits
 
 
 class Portfolio:
@@ -12,36 +21,78 @@ class Portfolio:
     - Updates holdings on Fill events
 
     Later we add:
-    - unrealized PnL
-    - risk limits
     - inventory targets
+
+    incremental_mtm=True keeps running market-value and cost-basis totals,
+    so mark_to_market() costs O(1) per tick instead of O(symbols). It is
+    not bit-identical to the full recompute: per-tick deltas add rounding
+    (NAV and unrealized PnL within ~1e-12 on the demo data, identical
+    snapshots to the cent). The totals are re-derived from the book at
+    every fill (O(symbols) per fill), so that rounding never outlives a
+    position change; recompute_mtm() does the same on demand.
+
+    history: optional PortfolioHistory, e.g.
+    PortfolioHistory(record="market", interval="1D", ohlc_interval="1h")
+    to keep daily samples plus hourly NAV bars instead of one row per tick.
+
+    Per-symbol state lives in a PositionBook (NumPy arrays indexed by
+    `registry` symbol ID); positions / avg_cost / last_prices are read-only
+    dict-like views of it. Pass the engine's or data handler's registry to
+    share symbol IDs.
+
+    allow_short=True lets SELL signals take the position short (down to
+    -max_shares_per_symbol). cost_basis picks how realized PnL is computed
+    when reducing a position: "avg" (average cost), "fifo" or "lifo"
+    (lot-level, see lots()).
+
+    risk_limits: optional RiskLimits; signals whose order would breach them
+    are dropped (see PreTradeRisk, reject counts in `risk.reject_counts()`).
     """
 
-    def __init__(self, base_quantity: int = 10, initial_capital: float = 1_000_000,max_shares_per_symbol: int = 500,):
+    def __init__(self, base_quantity: int = 10, initial_capital: float = 1_000_000,max_shares_per_symbol: int = 500,
+                 incremental_mtm: bool = False, history: PortfolioHistory = None,
+                 registry: SymbolRegistry = None, risk_limits: RiskLimits = None,
+                 allow_short: bool = False, cost_basis: str = "avg"):
+        if cost_basis not in COST_BASIS:
+            raise ValueError(f"Unknown cost basis: {cost_basis}")
+
         self.base_quantity = base_quantity
         self.initial_capital = initial_capital
 
+        self.registry = registry if registry is not None else SymbolRegistry()
+        self.book = PositionBook(self.registry)
+
         self.cash = initial_capital
-        self.positions = {}  # symbol -> shares
-        self.avg_cost = {}
+        self.positions = BookView(self.book, "position", "held", int)  # symbol -> shares
+        self.avg_cost = BookView(self.book, "avg_cost", "held", float)
         self.realized_pnl = 0.0
         self.total_commission = 0.0
-        self.last_prices = {}      # symbol -> last mid/last price
+        self.last_prices = PriceView(self.book)      # symbol -> last mid/last price
         self.unrealized_pnl = 0.0
         self.nav = initial_capital
-        self.history = []
+        self.history = history if history is not None else PortfolioHistory(registry=self.registry)
         self.max_shares_per_symbol = max_shares_per_symbol
 
+        # Signed positions; SELL signals may open shorts if allow_short
+        self.allow_short = allow_short
+        # "avg": average cost; "fifo" / "lifo": per-symbol LotQueue
+        self.cost_basis = cost_basis
+        self._lots = {}  # symbol ID -> LotQueue
 
-    def on_signal(self, signal: SignalEvent):
-        symbol = signal.symbol
-        side = signal.signal_type  # "BUY" or "SELL"
-        current_pos = self.positions.get(symbol, 0)
-        price = self.last_prices.get(symbol)
+        # Optional pre-trade risk layer (shares the book's symbol IDs)
+        self.risk = PreTradeRisk(risk_limits, self.registry) if risk_limits is not None else None
 
-        if price is None:
-            # No price known yet
-            return None
+        # Incremental mark-to-market: running totals of the book's per-symbol
+        # market value and cost basis (symbols with a known price only)
+        self.incremental_mtm = incremental_mtm
+        self._total_mkt_value = 0.0
+        self._total_cost_value = 0.0
+
+    def _size_order(self, sid: int, side: str, price: float) -> int:
+        """
+        Signed order quantity for a signal (+ buy, - sell, 0 = no order).
+        """
+        current_pos = int(self.book.position[sid])
 
         if side == "BUY":
             # target position after this order (capped)
@@ -51,40 +102,106 @@ class Portfolio:
             )
             qty = desired_pos - current_pos
             if qty <= 0:
-                return None
+                return 0
 
             est_cost = qty * price
             if est_cost > self.cash:
                 # not enough cash – skip
-                return None
-
-            return OrderEvent(
-                symbol=symbol,
-                timestamp=signal.timestamp,
-                direction="BUY",
-                quantity=qty,
-                order_type="MKT",
-            )
+                return 0
+            return qty
 
         elif side == "SELL":
-            # only sell up to what we own (no naked short)
-            qty = min(self.base_quantity, current_pos)
+            if self.allow_short:
+                # target position after this order (capped on the short side)
+                desired_pos = max(
+                    current_pos - self.base_quantity,
+                    -self.max_shares_per_symbol,
+                )
+                qty = current_pos - desired_pos
+            else:
+                # only sell up to what we own (no naked short)
+                qty = min(self.base_quantity, current_pos)
             if qty <= 0:
-                return None
+                return 0
+            return -qty
+
+        return 0
+
+    def on_signal(self, signal: SignalEvent):
+        symbol = signal.symbol
+        sid = self.book.sid(symbol)
+        price = float(self.book.last_price[sid])
 
-            return OrderEvent(
-                symbol=symbol,
+        if price != price:
+            # No price known yet
+            return None
+
+        qty = self._size_order(sid, signal.signal_type, price)
+        if qty == 0:
+            return None
+
+        if self.risk is not None and self.risk.check(sid, qty, price, signal.timestamp) != OK:
+            return None
+
+        return OrderEvent(
+            symbol=symbol,
+            timestamp=signal.timestamp,
+            direction="BUY" if qty > 0 else "SELL",
+            quantity=abs(qty),
+            order_type="MKT",
+        )
+
+    def on_signals(self, signals):
+        """
+        Batch version of on_signal for a batch of signals: orders are sized
+        one by one, then pre-trade risk checks them together
+        (PreTradeRisk.check_batch, each at its signal's timestamp). Returns
+        the accepted orders.
+        """
+        book = self.book
+        kept, sids, qtys, prices = [], [], [], []
+        for signal in signals:
+            sid = book.sid(signal.symbol)
+            price = float(book.last_price[sid])
+            if price != price:
+                continue
+            qty = self._size_order(sid, signal.signal_type, price)
+            if qty == 0:
+                continue
+            kept.append(signal)
+            sids.append(sid)
+            qtys.append(qty)
+            prices.append(price)
+
+        if not kept:
+            return []
+
+        if self.risk is not None:
+            stamps = [signal.timestamp for signal in kept]
+            codes = self.risk.check_batch(sids, qtys, prices, stamps).tolist()
+        else:
+            codes = [OK] * len(kept)
+
+        return [
+            OrderEvent(
+                symbol=signal.symbol,
                 timestamp=signal.timestamp,
-                direction="SELL",
-                quantity=qty,
+                direction="BUY" if qty > 0 else "SELL",
+                quantity=abs(qty),
                 order_type="MKT",
             )
-
-        return None
+            for signal, qty, code in zip(kept, qtys, codes)
+            if code == OK
+        ]
 
     def on_fill(self, fill: FillEvent):
         """
         Update positions, cash, avg cost, and realized PnL after a fill.
+
+        Positions are signed: a SELL through zero flips a long into a
+        short (and vice versa). The closed part realizes PnL against the
+        cost basis (average cost, or FIFO / LIFO lots); the rest opens a
+        new position at the fill price.
         """
         sym = fill.symbol
         qty = fill.quantity
@@ -92,81 +209,210 @@ class Portfolio:
         comm = fill.commission
     
         self.total_commission += comm
-    
-        pos = self.positions.get(sym, 0)
-        avg = self.avg_cost.get(sym, 0.0)
-    
+
+        book = self.book
+        sid = book.sid(sym)
+        pos = int(book.position[sid])
+        avg = float(book.avg_cost[sid])
+        book.set_held(sid)
+
+        # Fee breakdown (fills without a liquidity flag count as taker)
+        if fill.liquidity == "MAKER":
+            book.maker_fees[sid] += comm
+            book.maker_qty[sid] += qty
+        else:
+            book.taker_fees[sid] += comm
+            book.taker_qty[sid] += qty
+
         if fill.direction == "BUY":
-            # New position after buy
-            new_pos = pos + qty
-    
-            # Update average cost only if position increases
-            if new_pos != 0:
-                # Weighted average price
-                new_avg = (pos * avg + qty * px) / new_pos
-            else:
-                new_avg = 0.0
-    
-            self.positions[sym] = new_pos
-            self.avg_cost[sym] = new_avg
-    
+            signed = qty
             self.cash -= qty * px + comm
-    
         elif fill.direction == "SELL":
-            new_pos = pos - qty
-    
-            # Realized PnL only happens when you reduce/close a position
-            # We assume you are selling from an existing long.
-            realized = qty * (px - avg)
-            self.realized_pnl += realized
-    
-            self.positions[sym] = new_pos
-    
-            # If position is fully closed, reset avg cost
-            if new_pos == 0:
-                self.avg_cost[sym] = 0.0
-    
+            signed = -qty
             self.cash += qty * px - comm
+        else:
+            return
+        new_pos = pos + signed
+
+        lots = None
+        if self.cost_basis != "avg":
+            lots = self._lots.get(sid)
+            if lots is None:
+                lots = self._lots[sid] = LotQueue()
+
+        if pos == 0 or (pos > 0) == (signed > 0):
+            # Opening / adding to a position
+            if lots is not None:
+                lots.push(qty, px)
+                new_avg = lots.avg_cost()
+            else:
+                # Weighted average price
+                new_avg = (pos * avg + signed * px) / new_pos
+        else:
+            # Reducing, closing or flipping: realize PnL on the closed part
+            closed = min(qty, abs(pos))
+            side = 1 if pos > 0 else -1
+            if lots is not None:
+                basis = lots.close(closed, lifo=self.cost_basis == "lifo")
+                self.realized_pnl += side * (closed * px - basis)
+            else:
+                self.realized_pnl += side * closed * (px - avg)
+
+            if closed < qty:
+                # Flipped through zero: the remainder opens at px
+                if lots is not None:
+                    lots.push(qty - closed, px)
+                new_avg = px
+            elif new_pos == 0:
+                # Position fully closed: reset avg cost
+                new_avg = 0.0
+            else:
+                new_avg = lots.avg_cost() if lots is not None else avg
+
+        book.position[sid] = new_pos
+        book.avg_cost[sid] = new_avg
+
+        self.history.record_position(fill.timestamp, sym, new_pos, new_avg)
+
+        if self.incremental_mtm:
+            # Position / cost basis changed: re-derive the totals, shedding
+            # the rounding the per-tick deltas accumulated
+            self._resync_totals()
+
+        if self.risk is not None:
+            self.risk.on_position(sid, new_pos)
+
+    def lots(self, symbol: str):
+        """
+        Open (signed quantity, price) lots of a symbol, oldest first.
+        Average-cost portfolios report the position as a single lot.
+        """
+        sid = self.registry.get(symbol)
+        if sid is None or sid >= self.book.capacity:
+            return []
+        pos = int(self.book.position[sid])
+        if pos == 0:
+            return []
+        if self.cost_basis == "avg":
+            return [(pos, float(self.book.avg_cost[sid]))]
+        side = 1 if pos > 0 else -1
+        return [(side * q, p) for q, p in self._lots[sid].lots()]
 
     def mark_to_market(self, symbol: str, price: float, timestamp):
-        self.last_prices[symbol] = price
-    
-        unreal = 0.0
-        mkt_value = 0.0
-    
-        for sym, qty in self.positions.items():
-            px = self.last_prices.get(sym)
-            if px is None:
-                continue
-    
-            mkt_value += qty * px
-    
-            avg = self.avg_cost.get(sym, 0.0)
-            unreal += qty * (px - avg)
+        sid = self.book.sid(symbol)
+        self.book.mark(sid, price)
+
+        if self.incremental_mtm:
+            # Only this symbol's contribution changes
+            self._update_contribution(sid)
+            self.unrealized_pnl = self._total_mkt_value - self._total_cost_value
+            self.nav = self.cash + self._total_mkt_value
+        else:
+            self._full_mtm()
+
+        if self.risk is not None:
+            self.risk.on_mark(sid, price, timestamp, self.nav)
     
-        self.unrealized_pnl = unreal
+        self.history.append(
+            timestamp,
+            symbol,
+            price,
+            self.cash,
+            self.nav,
+            self.realized_pnl,
+            self.unrealized_pnl,
+            self.total_commission,
+        )
+
+    def _full_mtm(self):
+        # Every priced, held symbol in the book (see PositionBook.mtm)
+        mkt_value, self.unrealized_pnl = self.book.mtm()
         self.nav = self.cash + mkt_value
-    
-        self.history.append({
-            "timestamp": timestamp,
-            "symbol": symbol,
-            "price": price,
-            "cash": self.cash,
-            "positions": dict(self.positions),
-            "avg_cost": dict(self.avg_cost),
-            "unrealized_pnl": self.unrealized_pnl,
-            "realized_pnl": self.realized_pnl,
-            "nav": self.nav,
-            "total_commission": self.total_commission
-        })
 
+    def _update_contribution(self, sid):
+        """
+        Refresh the symbol's market value / cost basis and apply the delta
+        to the running totals.
+        """
+        sc = self.book.scalars
+        px = sc["last_price"][sid]
+        if px != px:
+            return
+        qty = sc["position"][sid]
+        mv = qty * px
+        cv = qty * sc["avg_cost"][sid]
+
+        mkt_value, cost_value = sc["mkt_value"], sc["cost_value"]
+        self._total_mkt_value += mv - mkt_value[sid]
+        self._total_cost_value += cv - cost_value[sid]
+        mkt_value[sid] = mv
+        cost_value[sid] = cv
 
+    def recompute_mtm(self):
+        """
+        Rebuild the incremental totals from scratch (and refresh NAV /
+        unrealized PnL), e.g. to shed accumulated rounding in long runs
+        without fills.
+        """
+        self._resync_totals()
+        self._full_mtm()
+
+    def _resync_totals(self):
+        book = self.book
+        n = len(self.registry)
+        priced = book.held[:n] & ~np.isnan(book.last_price[:n])
+        px = np.where(priced, book.last_price[:n], 0.0)
+        book.mkt_value[:n] = book.position[:n] * px
+        book.cost_value[:n] = np.where(priced, book.position[:n] * book.avg_cost[:n], 0.0)
+        self._total_mkt_value = float(book.mkt_value[:n].sum())
+        self._total_cost_value = float(book.cost_value[:n].sum())
+
+    def gross_exposure(self) -> float:
+        return self.book.gross_exposure()
+
+    def net_exposure(self) -> float:
+        return self.book.net_exposure()
+
+    def fee_breakdown(self):
+        """
+        Per-symbol commissions as a DataFrame: maker / taker fees (rebates
+        negative), total, and maker / taker filled shares.
+        """
+        book = self.book
+        book.ensure_capacity()
+        n = len(self.registry)
+        held = book.held[:n]
+        maker, taker = book.maker_fees[:n][held], book.taker_fees[:n][held]
+        return pd.DataFrame(
+            {
+                "maker_fees": maker,
+                "taker_fees": taker,
+                "total_fees": maker + taker,
+                "maker_qty": book.maker_qty[:n][held],
+                "taker_qty": book.taker_qty[:n][held],
+            },
+            index=pd.Index(np.asarray(self.registry.symbols, dtype=object)[held], name="symbol"),
+        )
 
     def equity_curve(self):
         """
-        Return list of (timestamp, nav).
+        Return NAV as a pd.Series indexed by timestamp (a view of the
+        history buffer, no copy).
+        """
+        return self.history.equity_curve()
+
+    def nav_ohlc(self):
+        """
+        NAV OHLC bars (requires a history created with ohlc_interval).
+        """
+        return self.history.nav_ohlc()
+
+    def history_frame(self):
+        """
+        Full history (cash, nav, realized/unrealized PnL, commission, ...)
+        as a DataFrame indexed by timestamp.
         """
-        return [(h["timestamp"], h["nav"]) for h in self.history]
+        return self.history.frame()
 
     def snapshot(self):
         return {
@@ -0,0 +1,173 @@
+# src/portfolio/position_book.py
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.core.symbols import SymbolArrays
+
+
+class PositionBook(SymbolArrays):
+    """
+    Per-symbol portfolio state in arrays indexed by symbol ID:
+    - position, avg_cost: holdings and cost basis (`held` marks symbols
+      that have had a fill)
+    - last_price: last mark price, NaN until the symbol is first marked
+    - mkt_value, cost_value: per-symbol contributions for incremental MTM
+    - maker_fees / taker_fees, maker_qty / taker_qty: commissions (rebates
+      negative) and filled shares by liquidity
+
+    Per-tick work (marking one symbol, reading one position) goes through
+    `scalars` (see SymbolArrays). mtm() loops over the held symbols
+    in Python while there are few of them and switches to vectorized
+    reductions above SCALAR_MTM_MAX; other portfolio-wide queries are
+    always vectorized.
+    """
+
+    SCALAR_MTM_MAX = 32
+
+    FIELDS = {
+        "position": ("i8", 0),
+        "avg_cost": ("f8", 0.0),
+        "held": ("?", False),
+        "last_price": ("f8", np.nan),
+        "mkt_value": ("f8", 0.0),
+        "cost_value": ("f8", 0.0),
+        "maker_fees": ("f8", 0.0),
+        "taker_fees": ("f8", 0.0),
+        "maker_qty": ("i8", 0),
+        "taker_qty": ("i8", 0),
+    }
+
+    def __init__(self, registry=None, capacity: int = 64):
+        super().__init__(registry, capacity)
+        self.held_sids = []  # symbols with a fill, in first-fill order
+
+    def set_held(self, sid: int):
+        if not self.held[sid]:
+            self.held[sid] = True
+            self.held_sids.append(sid)
+
+    def mark(self, sid: int, price: float):
+        self.scalars["last_price"][sid] = float(price)
+
+    def _priced(self):
+        n = len(self.registry)
+        px = self.last_price[:n]
+        known = self.held[:n] & (px == px)  # px == px drops NaN
+        return self.position[:n][known], px[known], self.avg_cost[:n][known]
+
+    def mtm(self):
+        """
+        (market value, unrealized PnL) over held symbols with a known price.
+        """
+        if len(self.held_sids) <= self.SCALAR_MTM_MAX:
+            sc = self.scalars
+            position, last_price, avg_cost = sc["position"], sc["last_price"], sc["avg_cost"]
+            mkt_value = unreal = 0.0
+            for sid in self.held_sids:
+                px = last_price[sid]
+                if px != px:  # not marked yet
+                    continue
+                qty = position[sid]
+                mkt_value += qty * px
+                unreal += qty * (px - avg_cost[sid])
+            return mkt_value, unreal
+
+        pos, px, avg = self._priced()
+        return float(pos @ px), float(pos @ (px - avg))
+
+    def market_value(self) -> float:
+        pos, px, _ = self._priced()
+        return float(pos @ px)
+
+    def unrealized_pnl(self) -> float:
+        pos, px, avg = self._priced()
+        return float(pos @ (px - avg))
+
+    def gross_exposure(self) -> float:
+        pos, px, _ = self._priced()
+        return float(np.dot(np.abs(pos), px))
+
+    def net_exposure(self) -> float:
+        return self.market_value()
+
+
+class BookView(Mapping):
+    """
+    Read-only dict-like view of one PositionBook field, keyed by ticker.
+    Keeps the old `portfolio.positions.get(symbol, 0)` style working.
+    """
+
+    def __init__(self, book: PositionBook, field: str, present: str, cast):
+        self._book = book
+        self._field = field
+        self._present = present
+        self._cast = cast
+
+    def _sid(self, symbol):
+        sid = self._book.registry.get(symbol)
+        if sid is None or sid >= self._book.capacity or not self._book.scalars[self._present][sid]:
+            return None
+        return sid
+
+    def __getitem__(self, symbol):
+        sid = self._sid(symbol)
+        if sid is None:
+            raise KeyError(symbol)
+        return self._cast(self._book.scalars[self._field][sid])
+
+    def get(self, symbol, default=None):
+        # Strategies call this per tick: inlined lookup, memoryview reads
+        # (already Python int / float)
+        book = self._book
+        sid = book.registry.get(symbol)
+        if sid is None or sid >= book.capacity:
+            return default
+        sc = book.scalars
+        if not sc[self._present][sid]:
+            return default
+        return sc[self._field][sid]
+
+    def __contains__(self, symbol):
+        return self._sid(symbol) is not None
+
+    def __iter__(self):
+        present = getattr(self._book, self._present)
+        for sid, sym in enumerate(self._book.registry.symbols):
+            if sid < self._book.capacity and present[sid]:
+                yield sym
+
+    def __len__(self):
+        return int(np.count_nonzero(self._book.view(self._present)))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class PriceView(BookView):
+    """
+    BookView over last_price: present once the symbol has been marked.
+    """
+
+    def __init__(self, book: PositionBook):
+        super().__init__(book, "last_price", "held", float)
+
+    def _sid(self, symbol):
+        sid = self._book.registry.get(symbol)
+        if sid is None or sid >= self._book.capacity:
+            return None
+        px = self._book.scalars["last_price"][sid]
+        return None if px != px else sid
+
+    def get(self, symbol, default=None):
+        sid = self._sid(symbol)
+        return default if sid is None else self._book.scalars["last_price"][sid]
+
+    def __iter__(self):
+        px = self._book.view("last_price")
+        for sid in np.flatnonzero(~np.isnan(px)).tolist():
+            yield self._book.registry.symbols[sid]
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self._book.view("last_price"))))
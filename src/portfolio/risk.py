@@ -0,0 +1,250 @@
+# src/portfolio/risk.py
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.core.symbols import SymbolArrays, SymbolRegistry
+from src.core.timeutil import NAT, interval_ns, to_ns
+
+
+INF = float("inf")
+DAY_NS = 86_400 * 1_000_000_000
+
+# Reject reasons (index into PreTradeRisk.rejects)
+OK = 0
+REJECT_SYMBOL_NOTIONAL = 1
+REJECT_GROSS = 2
+REJECT_NET = 3
+REJECT_RATE = 4
+REJECT_DAILY_LOSS = 5
+REJECT_NAMES = ("ok", "symbol_notional", "gross_exposure", "net_exposure", "order_rate", "daily_loss")
+
+
+@dataclass
+class RiskLimits:
+    """
+    Pre-trade limits. Exposures are notionals at the last mark price;
+    inf / None disables a limit.
+    """
+    max_gross_exposure: float = INF      # sum |position| * price
+    max_net_exposure: float = INF        # |sum position * price|
+    max_symbol_notional: float = INF     # |position| * price, default per symbol
+    symbol_notional: Dict[str, float] = field(default_factory=dict)  # per-symbol overrides
+    max_orders: Optional[int] = None     # at most max_orders ...
+    order_window: object = 1.0           # ... per this window (seconds or timedelta)
+    max_daily_loss: float = INF          # NAV drawdown from the day's first mark
+
+
+class PreTradeRisk(SymbolArrays):
+    """
+    Pre-trade risk layer for Portfolio.on_signal / on_signals.
+
+    State is kept incrementally so every check is O(1):
+    - per-symbol limit and signed exposure arrays (indexed by symbol ID)
+    - running gross / net exposure totals, updated on marks and fills
+    - a ring buffer of the last max_orders order times for the throttle
+    - NAV at the day's first mark for the daily-loss stop
+
+    Orders that reduce the absolute position in their symbol are always
+    allowed by the exposure and daily-loss limits (not by the throttle).
+    check_batch() evaluates all orders of one tick together with cumulative
+    exposure sums.
+    """
+
+    def __init__(self, limits: RiskLimits, registry: Optional[SymbolRegistry] = None):
+        self.FIELDS = {
+            "notional_limit": ("f8", limits.max_symbol_notional),
+            "exposure": ("f8", 0.0),
+            "position": ("i8", 0),
+            "price": ("f8", np.nan),
+        }
+        super().__init__(registry)
+        self.limits = limits
+        for sym, limit in limits.symbol_notional.items():
+            self.notional_limit[self.sid(sym)] = limit
+
+        self.gross = 0.0
+        self.net = 0.0
+
+        self._window = interval_ns(limits.order_window)
+        self._order_times = (
+            np.full(limits.max_orders, NAT, dtype=np.int64) if limits.max_orders else None
+        )
+        self._order_head = 0
+
+        self._day = None
+        self._day_start_nav = None
+        self._nav = None
+
+        self.rejects = np.zeros(len(REJECT_NAMES), dtype=np.int64)
+
+    # -----------------------
+    # State updates (called by Portfolio)
+    # -----------------------
+    def _set_exposure(self, sid: int):
+        px = self.price[sid]
+        new = float(self.position[sid] * px) if px == px else 0.0
+        old = float(self.exposure[sid])
+        self.gross += abs(new) - abs(old)
+        self.net += new - old
+        self.exposure[sid] = new
+
+    def on_mark(self, sid: int, price: float, timestamp, nav: float):
+        if sid >= self.capacity:
+            self._grow(sid)
+        self.price[sid] = price
+        self._set_exposure(sid)
+
+        self._nav = nav
+        ts = to_ns(timestamp)
+        if ts != NAT:
+            day = ts // DAY_NS
+            if day != self._day:
+                self._day = day
+                self._day_start_nav = nav
+
+    def on_position(self, sid: int, position: int):
+        if sid >= self.capacity:
+            self._grow(sid)
+        self.position[sid] = position
+        self._set_exposure(sid)
+
+    # -----------------------
+    # Checks
+    # -----------------------
+    def _loss_breached(self) -> bool:
+        if self._day_start_nav is None:
+            return False
+        return self._day_start_nav - self._nav >= self.limits.max_daily_loss
+
+    def _rate_ok(self, ts: int, n: int = 1) -> int:
+        """
+        How many of the next n orders at time ts the throttle admits.
+        """
+        times = self._order_times
+        if times is None or ts == NAT:
+            return n
+        k = len(times)
+        admitted = 0
+        for j in range(min(n, k)):
+            oldest = times[(self._order_head + j) % k]
+            if oldest != NAT and ts - oldest < self._window:
+                break
+            admitted += 1
+        return admitted
+
+    def _record_orders(self, ts: int, n: int):
+        times = self._order_times
+        if times is None or ts == NAT:
+            return
+        k = len(times)
+        for _ in range(n):
+            times[self._order_head] = ts
+            self._order_head = (self._order_head + 1) % k
+
+    def check(self, sid: int, quantity: int, price: float, timestamp=None) -> int:
+        """
+        Check one order (signed quantity: + buy, - sell) at price. Returns
+        OK (0) and records it for the throttle, or a REJECT_* code.
+        """
+        if sid >= self.capacity:
+            self._grow(sid)
+        ts = to_ns(timestamp)
+
+        code = OK
+        pos = int(self.position[sid])
+        new_pos = pos + quantity
+        if abs(new_pos) > abs(pos):
+            old = float(self.exposure[sid])
+            new = new_pos * price
+            if abs(new) > self.notional_limit[sid]:
+                code = REJECT_SYMBOL_NOTIONAL
+            elif self.gross + abs(new) - abs(old) > self.limits.max_gross_exposure:
+                code = REJECT_GROSS
+            elif abs(self.net + new - old) > self.limits.max_net_exposure:
+                code = REJECT_NET
+            elif self._loss_breached():
+                code = REJECT_DAILY_LOSS
+
+        if code == OK and self._rate_ok(ts) < 1:
+            code = REJECT_RATE
+
+        self.rejects[code] += 1
+        if code == OK:
+            self._record_orders(ts, 1)
+        return code
+
+    def check_batch(self, sids: np.ndarray, quantities: np.ndarray, prices: np.ndarray, timestamps=None) -> np.ndarray:
+        """
+        Check a batch of orders together. Returns the code per order
+        (OK = accepted); accepted orders are recorded for the throttle.
+
+        One cumulative scan in arrival order, O(n): each order is checked
+        like check() against the exposure totals plus the orders accepted
+        before it (same-symbol orders stack up from the position they
+        leave), so rejected orders never count against later ones.
+
+        timestamps: one per order (the throttle sees each order at its own
+        time), or a single time for the whole batch.
+        """
+        n = len(sids)
+        codes = np.zeros(n, dtype=np.int64)
+        if n == 0:
+            return codes
+        sids = np.asarray(sids, dtype=np.int64).tolist()
+        qty = np.asarray(quantities, dtype=np.int64).tolist()
+        px = np.asarray(prices, dtype=np.float64).tolist()
+        top = max(sids)
+        if top >= self.capacity:
+            self._grow(top)
+        if isinstance(timestamps, (list, tuple, np.ndarray)):
+            stamps = [to_ns(t) for t in timestamps]
+        else:
+            stamps = [to_ns(timestamps)] * n
+
+        limits = self.limits
+        loss_breached = self._loss_breached()
+        gross, net = self.gross, self.net
+        pending = {}  # sid -> (position, exposure) after this batch's accepted orders
+        for k in range(n):
+            sid = sids[k]
+            state = pending.get(sid)
+            if state is None:
+                pos, old = int(self.position[sid]), float(self.exposure[sid])
+            else:
+                pos, old = state
+            new_pos = pos + qty[k]
+            new = new_pos * px[k]
+            gross_k = gross + abs(new) - abs(old)
+            net_k = net + new - old
+
+            if abs(new_pos) > abs(pos):
+                if abs(new) > self.notional_limit[sid]:
+                    codes[k] = REJECT_SYMBOL_NOTIONAL
+                    continue
+                if gross_k > limits.max_gross_exposure:
+                    codes[k] = REJECT_GROSS
+                    continue
+                if abs(net_k) > limits.max_net_exposure:
+                    codes[k] = REJECT_NET
+                    continue
+                if loss_breached:
+                    codes[k] = REJECT_DAILY_LOSS
+                    continue
+
+            ts = stamps[k]
+            if self._rate_ok(ts) < 1:
+                codes[k] = REJECT_RATE
+                continue
+            self._record_orders(ts, 1)
+
+            gross, net = gross_k, net_k
+            pending[sid] = (new_pos, new)
+
+        np.add.at(self.rejects, codes, 1)
+        return codes
+
+    def reject_counts(self) -> Dict[str, int]:
+        return dict(zip(REJECT_NAMES, self.rejects.tolist()))
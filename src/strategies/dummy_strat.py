@@ -1,25 +1,31 @@
 # src/strategies/dummy_strat.py
 
 from src.core.events import SignalEvent
-from src.strategies.indicators import RollingSMA, EMA
+from src.strategies.indicators import EMABank, SMABank
 
 
 class DummyStrategy:
     """
     SMA/EMA crossover strategy with state:
 
-    - Keeps per-symbol SMA and EMA.
+    - Keeps per-symbol SMA and EMA in indicator banks indexed by the
+      portfolio's symbol IDs.
     - BUY once when EMA crosses above SMA (FLAT -> LONG).
     - SELL once when EMA crosses below SMA (LONG -> FLAT).
+
+    Signals flip on small SMA/EMA differences; for long live sessions set
+    sma_resync_every (e.g. 4096) to recompute each SMA sum exactly that
+    often instead of letting rounding drift build up.
     """
 
-    def __init__(self, portfolio, sma_window: int = 20, ema_period: int = 10):
+    def __init__(self, portfolio, sma_window: int = 20, ema_period: int = 10, sma_resync_every: int = None):
         self.portfolio = portfolio
         self.sma_window = sma_window
         self.ema_period = ema_period
 
-        self.sma = {}           # symbol -> RollingSMA
-        self.ema = {}           # symbol -> EMA
+        registry = getattr(portfolio, "registry", None)
+        self.sma = SMABank(sma_window, registry, resync_every=sma_resync_every)  # sid -> SMA
+        self.ema = EMABank(ema_period, self.sma.registry)        # sid -> EMA
         self.state = {}         # symbol -> "FLAT" or "LONG"
 
     def _price(self, event):
@@ -28,22 +34,15 @@ class DummyStrategy:
             price = (event.bid + event.ask) / 2.0
         return price
 
-    def _get_indicators(self, symbol):
-        if symbol not in self.sma:
-            self.sma[symbol] = RollingSMA(self.sma_window)
-        if symbol not in self.ema:
-            self.ema[symbol] = EMA(self.ema_period)
-        return self.sma[symbol], self.ema[symbol]
-
     def on_market_event(self, event):
         symbol = event.symbol
         price = self._price(event)
         if price is None:
             return None
 
-        sma_obj, ema_obj = self._get_indicators(symbol)
-        sma_val = sma_obj.update(price)
-        ema_val = ema_obj.update(price)
+        sid = self.sma.sid(symbol)
+        sma_val = self.sma.update(sid, price)
+        ema_val = self.ema.update(sid, price)
 
         # wait until SMA is fully "warmed up"
         if sma_val is None or ema_val is None: